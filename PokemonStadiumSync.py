@@ -5,35 +5,77 @@ import os
 import sys
 import time
 import shutil
+import hashlib
+import hmac
+import json
+import zlib
+import tempfile
 import threading
 import ctypes
+import heapq
+import socket
+import array
+import argparse
 import configparser
+from collections import namedtuple, deque
+from types import MappingProxyType
 
 # Third-Party Modules
 import psutil  # Process monitoring
-import pystray  # System tray management
-import watchdog  # File monitoring
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-from pystray import MenuItem as item, Icon
-from PIL import Image  # Used for tray icon handling
-from colorama import init, Fore  # Colored terminal output
 
-### ==================  Global Variables & Initialization ================== ###
+# pystray & PIL (tray icon), watchdog (file monitoring) and colorama (console colors)
+# are imported only when monitoring starts, so `--once` stays fast to launch.
 
-# Initialize Colorama for colored terminal output
-init(autoreset=True)
+### ==================  Global Variables & Initialization ================== ###
 
-# Windows-Specific Console Handling
+# Windows-Specific Console Handling (set in main)
 whnd = None
-if sys.platform == "win32":
-    whnd = ctypes.windll.kernel32.GetConsoleWindow()
 
-# Tracking Sync Status
-last_sync_time = {}      # Tracks last synchronization timestamps
-file_last_checked = {}   # Tracks when files were last checked
-file_last_modified = {}  # Tracks last modified timestamps
-file_last_synced = {}    # Tracks when files were last successfully synced
+class Fore:
+    """ANSI foreground colors, the same codes as colorama.Fore, so printing never needs colorama."""
+    RED = "\033[31m"
+    GREEN = "\033[32m"
+    YELLOW = "\033[33m"
+    BLUE = "\033[34m"
+    CYAN = "\033[36m"
+    WHITE = "\033[37m"
+    RESET = "\033[39m"
+    LIGHTBLACK_EX = "\033[90m"
+    LIGHTRED_EX = "\033[91m"
+    LIGHTGREEN_EX = "\033[92m"
+    LIGHTYELLOW_EX = "\033[93m"
+    LIGHTBLUE_EX = "\033[94m"
+    LIGHTMAGENTA_EX = "\033[95m"
+    LIGHTCYAN_EX = "\033[96m"
+    LIGHTWHITE_EX = "\033[97m"
+
+def enable_console_colors():
+    """Turns on ANSI escape handling in the Windows console without colorama."""
+    if sys.platform != "win32":
+        return
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    mode = ctypes.c_uint32()
+    if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+        kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+
+_print_lock = threading.Lock()
+_log_capture = threading.local()  # .lines collects a thread's log() lines instead of printing them
+
+def log_lines(lines):
+    """Prints lines in a single write, so output from the sync threads never runs together."""
+    if lines:
+        with _print_lock:
+            sys.stdout.write("".join(f"{line}\n" for line in lines))
+            sys.stdout.flush()
+
+def log(message=""):
+    """Prints one line (or adds it to the current thread's capture, see SyncEngine.sync_slots)."""
+    captured = getattr(_log_capture, "lines", None)
+    if captured is not None:
+        captured.append(message)
+    else:
+        log_lines([message])
 
 ### ==================  System Tray Functions ================== ###
 
@@ -70,6 +112,9 @@ def setup_tray():
         print("[INFO] PokemonStadiumSync.ico can't be found. Minimize to system tray disabled.")
         return  # ← prevent tray and check_minimize thread from starting
 
+    from pystray import MenuItem as item, Icon  # System tray management
+    from PIL import Image  # Used for tray icon handling
+
     try:
         image = Image.open(icon_path)
     except Exception as e:
@@ -81,15 +126,19 @@ def setup_tray():
 
     threading.Thread(target=check_minimize, daemon=True).start()
     tray_icon.run()
-    
 
-### ==================  Configuration Handling ================== ###
 
-# Initialize Config Parser
-config = configparser.ConfigParser()
-config.optionxform = str  # Preserve case sensitivity of keys
+### ==================  Configuration Handling ================== ###
 
 CONFIG_FILE = "PokemonStadiumSync.cfg"
+JOURNAL_FILE = "PokemonStadiumSync.journal.json"  # Last synced state of every slot
+JOURNAL_VERSION = 1
+HISTORY_DIR = "PokemonStadiumSync.history"  # Every save version replaced by a sync
+STABLE_INTERVAL = 0.5  # Seconds a save's size and mtime must stay unchanged to count as fully written
+WRITE_DETECTION_MODES = ("auto", "quiet")
+RETROARCH_HOLD_MODES = ("all", "in_use")
+INVALID_SAVE_RETRY = 5        # Seconds before retrying a sync held for a damaged save (doubles each time)
+INVALID_SAVE_RETRY_MAX = 300  # Longest retry delay; after that the sync waits for the save to change again
 
 DEFAULT_CONFIG = {
     "General": {"stay_open": "True", "run_minimized": "False"},
@@ -126,128 +175,340 @@ DEFAULT_CONFIG = {
     }
 }
 
-def load_config():
-    """Loads configuration from file. Exits if file is missing or incomplete."""
-    if not os.path.exists(CONFIG_FILE):
-        print(f"\n{Fore.RED}[ERROR]{Fore.RESET} Config file '{CONFIG_FILE}' not found.")
-        input("-> Please run the configuration tool (UI) to set it up before using this sync script.")
-        sys.exit(1)
-
-    config.read(CONFIG_FILE)
+class ConfigError(Exception):
+    """Raised when the config file is missing or incomplete."""
+
+class SyncConfig:
+    """Settings for one SyncEngine, normally read from PokemonStadiumSync.cfg."""
+
+    def __init__(self, base_dir, gb_dir="", gba_dir="", sav_dir="", gbrom_dir="",
+                 gb_slots=None, gba_slots=None, n64_roms=None,
+                 transferpak1="", transferpak2="",
+                 stay_open=True, run_minimized=False, quiet_period=3.0,
+                 history_max_versions=200, history_max_age_days=90.0, history_max_mb=64.0,
+                 validate_saves=True, write_detection="auto", retroarch_hold="all"):
+        # Directories (subfolders are relative to base_dir)
+        self.base_dir = os.path.normpath(base_dir)
+        self.gb_dir = os.path.join(self.base_dir, os.path.normpath(gb_dir))
+        self.gba_dir = os.path.join(self.base_dir, os.path.normpath(gba_dir))
+        self.sav_dir = os.path.join(self.base_dir, os.path.normpath(sav_dir))
+        self.gbrom_dir = os.path.join(self.base_dir, os.path.normpath(gbrom_dir))
+
+        # Stadium ROMs & Game Slots, keyed by lowercase name
+        self.n64_roms = {key.lower(): value for key, value in (n64_roms or {}).items()}
+        self.gb_slots = {key.lower(): value for key, value in (gb_slots or {}).items()}
+        self.gba_slots = {key.lower(): value for key, value in (gba_slots or {}).items()}
+
+        # Ports
+        self.transferpak1 = transferpak1.strip()
+        self.transferpak2 = transferpak2.strip()
+
+        # General Settings
+        self.stay_open = stay_open
+        self.run_minimized = run_minimized
+        self.quiet_period = quiet_period  # Seconds a save must be untouched before syncing
+        self.validate_saves = validate_saves  # Check in-save checksums before copying
+        # "auto": sync once a save is closed after writing (or stops changing); "quiet": wait quiet_period
+        self.write_detection = write_detection
+        # While RetroArch runs, "all": hold every slot; "in_use": hold only slots of the content it has loaded
+        self.retroarch_hold = retroarch_hold
+
+        # Save history retention (0 versions turns the history off)
+        self.history_max_versions = history_max_versions
+        self.history_max_age_days = history_max_age_days
+        self.history_max_mb = history_max_mb
+
+    @property
+    def slot_numbers(self):
+        """Dynamically assigns slot numbers to GB games."""
+        return {game: i + 1 for i, game in enumerate(self.gb_slots.keys())}
+
+    @classmethod
+    def from_file(cls, path=CONFIG_FILE):
+        """Loads configuration from file. Raises ConfigError if it is missing or incomplete."""
+        if not os.path.exists(path):
+            raise ConfigError(f"Config file '{path}' not found.")
+
+        config = configparser.ConfigParser()
+        config.optionxform = str  # Preserve case sensitivity of keys
+        config.read(path)
+
+        # Fail if any section or key is missing
+        for section, keys in DEFAULT_CONFIG.items():
+            if not config.has_section(section):
+                raise ConfigError(f"Missing section in config: [{section}]")
+            for key in keys:
+                if key not in config[section]:
+                    raise ConfigError(f"Missing config key: [{section}] {key}")
+
+        write_detection = config.get('General', 'write_detection', fallback='auto').strip().lower()
+        if write_detection not in WRITE_DETECTION_MODES:
+            raise ConfigError(f"Invalid [General] write_detection: {write_detection} (use {' or '.join(WRITE_DETECTION_MODES)})")
+        retroarch_hold = config.get('General', 'retroarch_hold', fallback='all').strip().lower()
+        if retroarch_hold not in RETROARCH_HOLD_MODES:
+            raise ConfigError(f"Invalid [General] retroarch_hold: {retroarch_hold} (use {' or '.join(RETROARCH_HOLD_MODES)})")
+
+        return cls(
+            base_dir=config.get('Directories', 'base_dir'),
+            gb_dir=config.get('Directories', 'gb_dir'),
+            gba_dir=config.get('Directories', 'gba_dir'),
+            sav_dir=config.get('Directories', 'sav_dir'),
+            gbrom_dir=config.get('Directories', 'gbrom_dir'),
+            gb_slots=dict(config.items('GBSlots')),
+            gba_slots=dict(config.items('GBASlots')),
+            n64_roms=dict(config.items('StadiumROMs')),
+            transferpak1=config.get('Ports', 'RetroarchTransferPak1', fallback=''),
+            transferpak2=config.get('Ports', 'RetroarchTransferPak2', fallback=''),
+            stay_open=config.getboolean('General', 'stay_open', fallback=True),
+            run_minimized=config.getboolean('General', 'run_minimized', fallback=False),
+            quiet_period=config.getfloat('General', 'quiet_period', fallback=3.0),
+            validate_saves=config.getboolean('General', 'validate_saves', fallback=True),
+            write_detection=write_detection,
+            retroarch_hold=retroarch_hold,
+            history_max_versions=config.getint('History', 'max_versions', fallback=200),
+            history_max_age_days=config.getfloat('History', 'max_age_days', fallback=90.0),
+            history_max_mb=config.getfloat('History', 'max_size_mb', fallback=64.0)
+        )
+
+
+### ==================  Single Instance & Control Channel ================== ###
+
+CONTROL_HOST = "127.0.0.1"
+CONTROL_PORT_RANGE = (20000, 32767)  # Below the ephemeral ranges (32768+ on Linux, 49152+ elsewhere); see control_port
+CONTROL_TOKEN_FILE = "control.token"  # In user_state_dir(), readable by its user only
+
+def user_state_dir():
+    """Returns (creating it if needed) a folder in the user's profile that only this user can read."""
+    if sys.platform == "win32":
+        path = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "PokemonStadiumSync")
+    else:
+        path = os.path.join(os.path.expanduser("~"), ".pokemonstadiumsync")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
 
-    # Warn if any section or key is missing
-    for section, keys in DEFAULT_CONFIG.items():
-        if not config.has_section(section):
-            input(f"{Fore.RED}[ERROR]{Fore.RESET} Missing section in config: [{section}]")
-            sys.exit(1)
-        for key in keys:
-            if key not in config[section]:
-                input(f"{Fore.RED}[ERROR]{Fore.RESET} Missing config key: [{section}] {key}")
-                sys.exit(1)
+def instance_id(config_path=CONFIG_FILE):
+    """Returns the id of this user's instance running on config_path.
 
+    Derived from the user name and the config file's full path, so instances of other
+    users, or for other config files, never guard against or answer for each other.
+    """
+    import getpass  # Only needed for the control channel, kept out of --once startup
 
-# Load Configuration
-load_config()
+    key = f"{getpass.getuser()}\0{os.path.normcase(os.path.abspath(config_path))}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
 
-# Read General Settings
-stay_open = config.getboolean('General', 'stay_open', fallback=True)
-run_minimized = config.getboolean('General', 'run_minimized', fallback=False)
+def control_port(config_path=CONFIG_FILE):
+    """Returns the localhost port the instance running on config_path listens on (see instance_id)."""
+    low, high = CONTROL_PORT_RANGE
+    return low + int(instance_id(config_path), 16) % (high - low + 1)
 
-# Hide terminal immediately if run_minimized is True
-if run_minimized and sys.platform == "win32" and whnd:
-    ctypes.windll.user32.ShowWindow(whnd, 0)
+def control_token():
+    """Returns the user's control token, creating the token file (owner-only) on first use.
 
-# Handle console minimization
-if sys.platform == "win32":
-    if whnd:
-        try:
-            tray_thread = threading.Thread(target=setup_tray, daemon=True)
-            tray_thread.start()
-        except Exception as e:
-            print(f"Error starting system tray: {e}")
-
-# Read Ports
-retroarch_transferpak1 = config.get('Ports', 'RetroarchTransferPak1', fallback='').strip()
-retroarch_transferpak2 = config.get('Ports', 'RetroarchTransferPak2', fallback='').strip()
-
-# Read Directories & Normalize Paths
-try:
-    base_dir = os.path.normpath(config.get('Directories', 'base_dir'))
-    gb_dir = os.path.join(base_dir, os.path.normpath(config.get('Directories', 'gb_dir')))
-    gba_dir = os.path.join(base_dir, os.path.normpath(config.get('Directories', 'gba_dir')))
-    sav_dir = os.path.join(base_dir, os.path.normpath(config.get('Directories', 'sav_dir')))
-    gbrom_dir = os.path.join(base_dir, os.path.normpath(config.get('Directories', 'gbrom_dir')))
-except configparser.NoOptionError as e:
-    input(f"Error reading directories from config: {e}")
-    sys.exit(1)
-
-
-### ==================  Kill Running Instances ================== ###
-
-def kill_previous_instances():
-    """Kills older instances of PokemonStadiumSync while keeping the latest one alive."""
-    current_pid = os.getpid()
-    current_script = os.path.normcase(os.path.abspath(__file__))
-    exe_name = "PokemonStadiumSync.exe"
-
-    instances = []
-
-    # Scan all running processes
-    for process in psutil.process_iter(attrs=["pid", "name", "cmdline", "create_time"]):
-        try:
-            process_pid = process.info["pid"]
-            process_name = process.info["name"]
-            process_cmdline = process.info["cmdline"]
-            process_start_time = process.info["create_time"]  # Get process start time
+    Every command must start with it, so other users and programs on the machine can't
+    hand over, pause or reload an instance they don't own.
+    """
+    import secrets  # Only needed to create a token, kept out of --once startup
 
-            # Skip self
-            if process_pid == current_pid:
-                continue
+    path = os.path.join(user_state_dir(), CONTROL_TOKEN_FILE)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        for _ in range(20):  # Another instance may be writing it right now
+            with open(path, "r", encoding="ascii") as f:
+                token = f.read().strip()
+            if token:
+                return token
+            time.sleep(0.05)
+        raise OSError(f"The control token file {path} is empty. Delete it to create a new one.")
+
+    token = secrets.token_hex(16)
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(token)
+    return token
+
+def send_command(command, config_path=CONFIG_FILE, token=None, timeout=5.0):
+    """Sends one command line to the instance running on config_path and returns its JSON reply.
+
+    The line starts with the user's control token and the instance id, so a listener on
+    the port that runs another config file refuses it.
+    Raises OSError if nothing is listening or the listener is not PokemonStadiumSync.
+    """
+    port = control_port(config_path)
+    line = f"{token or control_token()} {instance_id(config_path)} {command}"
+    with socket.create_connection((CONTROL_HOST, port), timeout=timeout) as conn:
+        conn.sendall(line.encode("utf-8") + b"\n")
+        with conn.makefile("r", encoding="utf-8") as reply:
+            line = reply.readline()
+    try:
+        return json.loads(line)
+    except ValueError:
+        raise OSError(f"Unexpected reply on port {port}, is another program using it?") from None
 
-            # Check if process is another instance of this script or EXE
-            if process_name.lower() == exe_name.lower():
-                instances.append((process_pid, process_name, process_start_time))
-            elif process_cmdline:
-                for arg in process_cmdline:
-                    if os.path.normcase(os.path.abspath(arg)) == current_script:
-                        instances.append((process_pid, arg, process_start_time))
-                        break
+class InstanceLock:
+    """Lock file in user_state_dir() held by the one instance running on a config file.
 
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
+    The OS drops the lock when the process exits, however it exits.
+    """
 
-    # Exit early if no instances were found
-    if not instances:
-        return
+    def __init__(self, config_path=CONFIG_FILE):
+        self.path = os.path.join(user_state_dir(), f"instance-{instance_id(config_path)}.lock")
+        self._file = None
 
-    # Sort instances by start time (oldest first)
-    instances.sort(key=lambda x: x[2])
+    def acquire(self):
+        """Takes the lock without waiting. Returns False if another process holds it."""
+        lock_file = open(self.path, "a+b")
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()  # Closing the file drops the lock
+            self._file = None
+
+class ControlServer:
+    """Makes this process the single running instance on a config file and takes its commands.
+
+    acquire() takes the instance lock, asking an instance that already holds it to hand
+    over first, then binds the localhost control port. Each connection, handled on its own
+    thread, sends one command line starting with the control token and the instance id,
+    and gets one JSON line back; lines with a wrong token or id are refused.
+    """
+
+    def __init__(self, config_path, token):
+        self.config_path = config_path
+        self.port = control_port(config_path)
+        self.instance = instance_id(config_path)
+        self.token = token
+        self.on_handover = None  # Called after replying to a newer instance; should stop and exit
+        self.handlers = {}  # Command name -> function(*args) returning the reply dict
+        self.lock = InstanceLock(config_path)
+        self._socket = None
+
+    @property
+    def listening(self):
+        return self._socket is not None
+
+    def _bind(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            if sys.platform == "win32":
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+            else:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # Never shares a listening port on POSIX
+            sock.bind((CONTROL_HOST, self.port))
+            sock.listen()
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+
+    def _retry(self, attempt, timeout):
+        """Calls attempt() every 50 ms until it returns True or timeout passes. Returns its last result."""
+        deadline = time.monotonic() + timeout
+        while not attempt():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
 
-    # Keep the most recent instance and terminate all older ones
-    for process_pid, process_name, _ in instances[:-1]:  # Keep only the last (newest) instance
+    def _try_bind(self):
         try:
-            print(f"[INFO]: Killing older instance (PID {process_pid})")
-            psutil.Process(process_pid).terminate()
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
+            self._bind()
+            return True
+        except OSError:
+            return False
+
+    def acquire(self, timeout=5.0):
+        """Takes over as the single instance and binds the control port.
+
+        Returns False if a running instance holds the lock and does not hand over. If only
+        the port can't be bound (another program uses it), the lock still guards the config
+        file and this returns True with listening False.
+        """
+        if not self.lock.acquire():
+            try:
+                reply = send_command("handover", self.config_path, self.token)
+            except OSError:
+                return False
+            if not reply.get("ok") or not self._retry(self.lock.acquire, timeout):
+                return False
 
+        self._retry(self._try_bind, timeout)
+        return True
 
-# Execute cleanup
-kill_previous_instances()
+    def handle(self, command, args):
+        """Answers one command. Returns the reply dict."""
+        import inspect  # Only needed to check command arguments, kept out of --once startup
 
-### ==================  Game Slots & Save File Management ================== ###
+        if command == "handover":
+            return {"ok": True} if not args else {"ok": False, "error": "Usage: handover"}
+        handler = self.handlers.get(command)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown command: {command} (use {', '.join(sorted(self.handlers))})"}
 
-# Read Stadium ROMs & Game Slots from Config
-n64_roms = {key.lower(): value for key, value in config.items('StadiumROMs')} if config.has_section('StadiumROMs') else {}
-gb_slots = {key.lower(): value for key, value in config.items('GBSlots')} if config.has_section('GBSlots') else {}
-gba_slots = {key.lower(): value for key, value in config.items('GBASlots')} if config.has_section('GBASlots') else {}
+        signature = inspect.signature(handler)
+        try:
+            signature.bind(*args)
+        except TypeError:
+            params = [name.upper() if p.default is p.empty else f"[{name.upper()}]" for name, p in signature.parameters.items()]
+            return {"ok": False, "error": f"Usage: {' '.join([command] + params)}"}
+        return handler(*args)
+
+    def _serve_connection(self, conn):
+        with conn:
+            conn.settimeout(2.0)
+            try:
+                with conn.makefile("r", encoding="utf-8") as f:
+                    words = f.readline().split()
+            except (OSError, UnicodeDecodeError):
+                return
+            token, instance, command, args = (words[0], words[1], words[2].lower(), words[3:]) if len(words) > 2 else ("", "", "", [])
+            if not hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8")):
+                command, reply = "", {"ok": False, "error": "Not authorized (wrong control token)"}
+            elif instance != self.instance:
+                command, reply = "", {"ok": False, "error": "This port belongs to an instance running another config file"}
+            else:
+                try:
+                    reply = self.handle(command, args)
+                except Exception as e:
+                    reply = {"ok": False, "error": str(e)}
+            try:
+                conn.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+            except OSError:
+                return
+
+        if command == "handover" and self.on_handover is not None:
+            log("\n[INFO] A newer instance was started, handing over to it.")
+            self.on_handover()
+
+    def serve(self):
+        """Answers commands until close() is called, each connection on its own thread. Run on a background thread."""
+        while True:
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                return  # Socket closed
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+        self.lock.release()
 
-# Assign Slot Numbers Dynamically
-def assign_slot_numbers():
-    """Dynamically assigns slot numbers to GB games."""
-    return {game: i + 1 for i, game in enumerate(gb_slots.keys())}
 
-slot_numbers = assign_slot_numbers()
+### ==================  Game Slots & Save File Management ================== ###
 
 # Define Game Name Formatting
 def format_game_name(game_name):
@@ -272,299 +533,1835 @@ slot_colors = {
 }
 
 
-### ================== Save Synchronization ================== ###
+### ==================  Slot Lookup Table ================== ###
 
-def get_last_modified_time(file_path):
-    """Get last modified time or 0 if file doesn't exist."""
-    return os.path.getmtime(file_path) if os.path.exists(file_path) else 0
-
-def get_transferpak_indicator(slot):
-    slot_lower = slot.lower()
-    if slot_lower == retroarch_transferpak1.lower():
-        return f"{Fore.LIGHTBLACK_EX}]TransferPak{Fore.RED}1{Fore.RESET}"
-    elif slot_lower == retroarch_transferpak2.lower():
-        return f"{Fore.LIGHTBLACK_EX}]TransferPak{Fore.YELLOW}2{Fore.RESET}"
-    return ""
-
-def prepare_transferpak_roms():
-    """Copies GB ROMs for TransferPak slots to the TransferPak folder if needed."""
-    for pak_slot, rom_key in [(retroarch_transferpak1, "stadium 1"), (retroarch_transferpak2, "stadium 2")]:
-        if not pak_slot:
-            continue  # Skip empty assignments
-
-        n64_rom_name = n64_roms.get(rom_key, "").strip()
-        if not n64_rom_name:
-            continue
-
-        rom_output_path = os.path.join(sav_dir, f"{n64_rom_name}.gb")
-        if os.path.exists(rom_output_path):
-            continue  # Already present, skip
-
-        game_key = pak_slot.lower()
-        matching_prefix = gb_slots.get(game_key, "").lower()
-        found_rom = None
-        for ext in [".gb", ".gbc"]:
-            candidate = os.path.join(gbrom_dir, f"{matching_prefix}{ext}")
-            if os.path.exists(candidate):
-                found_rom = candidate
-                break
+# A single save slot: lowercase game name plus its .srm and .sav paths
+SaveSlot = namedtuple("SaveSlot", ["name", "srm", "sav"])
+
+def normalize_save_path(path):
+    """Normalizes a path for comparison against slot table keys."""
+    return os.path.normcase(os.path.abspath(path))
+
+class SlotTable:
+    """Immutable lookup of every configured slot by its normalized .srm/.sav path."""
+
+    def __init__(self, slots):
+        self._slots = tuple(slots)
+        by_path = {}
+        for slot in self._slots:
+            by_path[normalize_save_path(slot.srm)] = (slot, slot.sav)
+            by_path[normalize_save_path(slot.sav)] = (slot, slot.srm)
+        self._by_path = MappingProxyType(by_path)
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def lookup(self, path):
+        """Returns (slot, partner_path) for a save path, or None if it belongs to no slot."""
+        return self._by_path.get(normalize_save_path(path))
 
-        if found_rom:
-            shutil.copy2(found_rom, rom_output_path)
-            print(f"[INFO] Copied GB ROM for {format_game_name(pak_slot)} → {n64_rom_name}.gb")
+
+### ================== Save Validation ================== ###
+
+# Gen 1 main data checksum: (start, checksum offset). The byte sum of start..offset-1, inverted.
+# International carts store it at 0x3523, Japanese carts (e.g. Green) at 0x3594.
+GEN1_CHECKSUMS = ((0x2598, 0x3523), (0x2598, 0x3594))
+
+# Gen 2 checksums: (((start, end), ...), checksum offset), a 16-bit little endian byte sum of every
+# start..end range. The first is the main copy, the second the backup, which Gold/Silver store in
+# three pieces. The game falls back to the backup if the main one is bad, so either being valid is enough.
+GEN2_GOLD_SILVER_CHECKSUMS = (
+    (((0x2009, 0x2D68),), 0x2D69),
+    (((0x0C6B, 0x17EC), (0x3D96, 0x3F3F), (0x7E39, 0x7E6C)), 0x7E6D)
+)
+GEN2_CHECKSUMS = {
+    "gold": GEN2_GOLD_SILVER_CHECKSUMS,
+    "silver": GEN2_GOLD_SILVER_CHECKSUMS,
+    "crystal": ((((0x2009, 0x2B82),), 0x2D0D), (((0x1209, 0x1D82),), 0x1F0D))
+}
+
+# Gen 3 flash: two blocks of 14 sections, each section 4 KB with a footer at 0xFF4
+GEN3_BLOCKS = (0x0000, 0xE000)
+GEN3_SECTION_SIZE = 0x1000
+GEN3_SECTION_COUNT = 14
+GEN3_SIGNATURE = 0x08012025
+GEN3_DATA_SIZES = (3884, 3968, 3968, 3968, 3848, 3968, 3968, 3968, 3968, 3968, 3968, 3968, 3968, 2000)
+
+def _le16(data, offset):
+    return data[offset] | data[offset + 1] << 8
+
+def _le32(data, offset):
+    return int.from_bytes(data[offset:offset + 4], "little")
+
+def _sum_words(data):
+    """Sums a buffer as little endian 32-bit words."""
+    words = data.cast("I")
+    if sys.byteorder == "big":
+        words = array.array("I", words)
+        words.byteswap()
+    return sum(words)
+
+def validate_gen1_save(data):
+    """Returns None if a Red/Blue/Yellow/Green save has a valid main checksum, else the reason."""
+    for start, checksum_offset in GEN1_CHECKSUMS:
+        if len(data) > checksum_offset and (~sum(data[start:checksum_offset])) & 0xFF == data[checksum_offset]:
+            return None
+    return "Gen 1 checksum mismatch"
+
+def validate_gen2_save(data, game):
+    """Returns None if a Gold/Silver/Crystal save has a valid main or backup checksum, else the reason."""
+    for ranges, checksum_offset in GEN2_CHECKSUMS[game]:
+        if len(data) > checksum_offset + 1:
+            total = sum(sum(data[start:end + 1]) for start, end in ranges)
+            if total & 0xFFFF == _le16(data, checksum_offset):
+                return None
+    return "Gen 2 checksum mismatch"
+
+def validate_gen3_save(data):
+    """Returns None if at least one of the two save blocks of a GBA Pokemon save is intact, else the reason."""
+    if len(data) < GEN3_BLOCKS[-1] + GEN3_SECTION_COUNT * GEN3_SECTION_SIZE:
+        return "GBA save is too short"
+
+    for block in GEN3_BLOCKS:
+        seen = set()
+        for index in range(GEN3_SECTION_COUNT):
+            section = block + index * GEN3_SECTION_SIZE
+            section_id = _le16(data, section + 0xFF4)
+            if _le32(data, section + 0xFF8) != GEN3_SIGNATURE or section_id >= GEN3_SECTION_COUNT or section_id in seen:
+                break
+            total = _sum_words(data[section:section + GEN3_DATA_SIZES[section_id]])
+            if ((total >> 16) + total) & 0xFFFF != _le16(data, section + 0xFF6):
+                break
+            seen.add(section_id)
         else:
-            print(f"[WARNING] No GB ROM found for {format_game_name(pak_slot)} in gbrom_dir.")
+            return None
+    return "no intact GBA save block"
+
+SAVE_VALIDATORS = {
+    **dict.fromkeys(("green", "red", "blue", "yellow"), validate_gen1_save),
+    **{game: lambda data, game=game: validate_gen2_save(data, game) for game in GEN2_CHECKSUMS},
+    **dict.fromkeys(("ruby", "sapphire", "emerald", "firered", "leafgreen"), validate_gen3_save)
+}
+
+def check_save_file(slot, path):
+    """Returns None if path holds a valid save for slot (or slot has no validator), else the reason."""
+    validator = SAVE_VALIDATORS.get(slot.lower())
+    if validator is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return f"could not be read ({e.strerror})"
+    with memoryview(data) as view:
+        return validator(view)
+
+
+### ================== Content Hashing ================== ###
+
+# Cache of save file hashes: normalized path -> (size, mtime_ns, digest)
+_hash_cache = {}
+_hash_cache_lock = threading.Lock()
+
+def get_file_hash(file_path, state=None):
+    """Returns the BLAKE2 digest of a file, rehashing only if its size or mtime changed.
+
+    state is the file's FileState from a snapshot, if the caller has one, to skip the stat call.
+    """
+    if state is None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        state = FileState(stat.st_size, stat.st_mtime_ns)
+
+    key = os.path.normcase(os.path.abspath(file_path))
+    with _hash_cache_lock:
+        cached = _hash_cache.get(key)
+    if cached and cached[:2] == state:
+        return cached[2]
+
+    digest = hashlib.blake2b()
+    try:
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+
+    with _hash_cache_lock:
+        _hash_cache[key] = (state.size, state.mtime_ns, digest.digest())
+    return digest.digest()
+
+def files_identical(path_a, path_b, state_a, state_b):
+    """Returns True if both files have the same size and content, going by their snapshot FileStates."""
+    if state_a.size != state_b.size:
+        return False
+    hash_a = get_file_hash(path_a, state_a)
+    return hash_a is not None and hash_a == get_file_hash(path_b, state_b)
+
+
+### ================== File Snapshots ================== ###
+
+# Size and modification time of one save file, as seen by a snapshot
+FileState = namedtuple("FileState", ["size", "mtime_ns"])
+
+class FileSnapshot:
+    """Size and mtime of a set of save files, read once so a sync pass makes all its decisions from it.
+
+    Missing files are simply absent. Keys are normalized with normalize_save_path().
+    """
+
+    def __init__(self, states=None):
+        self._states = states or {}
+
+    @classmethod
+    def scan(cls, paths):
+        """Lists each folder holding one of the paths once with os.scandir.
+
+        Only the wanted entries are stat'ed; on Windows and SMB shares that stat
+        comes with the directory listing itself.
+        """
+        wanted_by_dir = {}
+        for path in paths:
+            key = normalize_save_path(path)
+            wanted_by_dir.setdefault(os.path.dirname(key), set()).add(key)
+
+        states = {}
+        for folder, wanted in wanted_by_dir.items():
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        key = os.path.normcase(os.path.join(folder, entry.name))
+                        if key not in wanted:
+                            continue
+                        try:
+                            if entry.is_file():
+                                stat = entry.stat()
+                                states[key] = FileState(stat.st_size, stat.st_mtime_ns)
+                        except OSError:
+                            pass  # Vanished while listing
+            except OSError:
+                pass  # Folder missing, so are its files
+        return cls(states)
+
+    @classmethod
+    def stat(cls, paths):
+        """Stats a handful of paths directly, cheaper than listing their folders."""
+        states = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            states[normalize_save_path(path)] = FileState(stat.st_size, stat.st_mtime_ns)
+        return cls(states)
+
+    def get(self, path):
+        """Returns the FileState of a path, or None if it did not exist."""
+        return self._states.get(normalize_save_path(path))
+
+
+# Timestamp resolutions of common filesystems: ext4/APFS (1 ns), NTFS (100 ns), SMB (1 us),
+# exFAT (10 ms), some network shares (1 s) and FAT32 (2 s)
+TIMESTAMP_GRANULARITIES_NS = (0, 100, 1_000, 10_000_000, 1_000_000_000, 2_000_000_000)
+# An odd and an even second with an awkward fraction, so any coarse filesystem has to round them.
+# Probing both tells 1 s from 2 s whether the filesystem rounds down or up.
+TIMESTAMP_PROBES_NS = (1_700_000_001_987_654_321, 1_700_000_000_987_654_321)
+
+def probe_timestamp_granularity(folder):
+    """Returns the timestamp resolution (ns) of the filesystem holding folder, by storing times and reading them back.
+
+    The resolution is the coarsest step every stored time is a multiple of, so it does not
+    matter whether the filesystem rounds down, up or to the nearest step.
+    """
+    try:
+        fd, probe = tempfile.mkstemp(prefix=".pss-probe-", dir=folder)
+    except OSError:
+        return 0
+    try:
+        os.close(fd)
+        stored = []
+        for probe_ns in TIMESTAMP_PROBES_NS:
+            os.utime(probe, ns=(probe_ns, probe_ns))
+            stored.append(os.stat(probe).st_mtime_ns)
+    except OSError:
+        return 0
+    finally:
+        try:
+            os.remove(probe)
+        except OSError:
+            pass
+    return min(max(g for g in TIMESTAMP_GRANULARITIES_NS if g == 0 or stored_ns % g == 0) for stored_ns in stored)
+
+
+### ================== Sync Journal ================== ###
+
+class SyncJournal:
+    """Remembers the (size, mtime_ns, hash) both files of each slot had after their last sync.
+
+    Slots whose files still match their entry are skipped without hashing, and a slot
+    where both files moved on since the last sync is reported as a conflict. With no
+    path the journal only lives in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = self._load() if path else {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Slots flush from several dispatcher threads
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(journal, dict) or journal.get("version") != JOURNAL_VERSION:
+            return {}
+        return journal.get("slots", {})
+
+    def get(self, srm, sav):
+        """Returns (srm_state, sav_state, hash) from the last sync of the pair, or None."""
+        with self._lock:
+            entry = self._entries.get(normalize_save_path(srm))
+        if not entry or entry.get("sav") != normalize_save_path(sav):
+            return None  # Never synced, or the slot now points at another .sav
+        digest = bytes.fromhex(entry["hash"]) if entry.get("hash") else None
+        return FileState(*entry["srm_state"]), FileState(*entry["sav_state"]), digest
+
+    def record(self, srm, sav, srm_state, sav_state, digest=None):
+        """Stores the state of a pair right after it was synced."""
+        entry = {
+            "sav": normalize_save_path(sav),
+            "srm_state": list(srm_state),
+            "sav_state": list(sav_state),
+            "hash": digest.hex() if digest else None
+        }
+        with self._lock:
+            key = normalize_save_path(srm)
+            if self._entries.get(key) != entry:
+                self._entries[key] = entry
+                self._dirty = True
+
+    def flush(self):
+        """Writes the journal to disk if anything changed, replacing the old file atomically."""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty or not self.path:
+                    return
+                journal = {"version": JOURNAL_VERSION, "slots": dict(self._entries)}
+                self._dirty = False
+
+            tmp_file = f"{self.path}.tmp"
+            try:
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(journal, f)
+                os.replace(tmp_file, self.path)
+            except OSError as e:
+                log(f"{Fore.YELLOW}[WARNING]{Fore.RESET} Could not save sync journal: {e}")
+
+
+### ================== File Copying ================== ###
+
+def copy_mtime(src, dst):
+    """Gives dst the exact (nanosecond) modification time of src."""
+    mtime_ns = os.stat(src).st_mtime_ns
+    os.utime(dst, ns=(mtime_ns, mtime_ns))
+
+# Largest chunk handed to the kernel per copy_file_range/sendfile call
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+def _copy_file_data(src_fd, dst_fd):
+    """Copies file contents in-kernel (copy_file_range, then sendfile) where supported, else buffered."""
+    kernel_copies = []
+    if hasattr(os, "copy_file_range"):
+        kernel_copies.append(lambda: os.copy_file_range(src_fd, dst_fd, COPY_CHUNK_SIZE))
+    if sys.platform.startswith("linux") and hasattr(os, "sendfile"):
+        kernel_copies.append(lambda: os.sendfile(dst_fd, src_fd, None, COPY_CHUNK_SIZE))
+
+    size = os.fstat(src_fd).st_size
+    for copy_chunk in kernel_copies:
+        copied = 0
+        try:
+            chunk = copy_chunk()
+            while chunk:
+                copied += chunk
+                chunk = copy_chunk()
+        except OSError:
+            pass
+        # Some filesystems (FUSE, SMB, procfs) report 0 without copying anything: only trust a full copy
+        if copied and copied >= size:
+            return
+        # Not supported for this pair of files (e.g. across filesystems) or cut short: rewind and try the next way
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        os.ftruncate(dst_fd, 0)
+
+    with open(src_fd, "rb", closefd=False) as src_file, open(dst_fd, "wb", closefd=False) as dst_file:
+        shutil.copyfileobj(src_file, dst_file)
+
+def atomic_copy(src, dst):
+    """Copies src over dst like shutil.copy2, via a temp file in dst's folder and os.replace."""
+    # Replace the file a symlinked save points at, not the link itself
+    dst = os.path.realpath(dst)
+    fd, tmp_path = tempfile.mkstemp(prefix=".pss-", suffix=".tmp", dir=os.path.dirname(os.path.abspath(dst)))
+    try:
+        with open(src, "rb") as src_file:
+            _copy_file_data(src_file.fileno(), fd)
+        os.fsync(fd)
+        os.close(fd)
+        fd = None
+        shutil.copystat(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if fd is not None:
+            os.close(fd)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def atomic_write(path, data):
+    """Writes bytes to path via a temp file in the same folder and os.replace."""
+    fd, tmp_path = tempfile.mkstemp(prefix=".pss-", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
-def try_copy(src, dst, retries=3, delay=0.5):
-    """Attempts to copy a file with retry support for PermissionError."""
+def try_copy(src, dst, retries=4, delay=0.25):
+    """Atomically copies a file, retrying PermissionError with exponential backoff."""
     for attempt in range(retries):
         try:
-            shutil.copy2(src, dst)
+            atomic_copy(src, dst)
             return True
         except PermissionError as e:
             if attempt < retries - 1:
-                time.sleep(delay)
+                time.sleep(delay * 2 ** attempt)
             else:
-                print(f"[ERROR] Could not copy {src} → {dst}: {e}")
+                log(f"[ERROR] Could not copy {src} → {dst}: {e}")
                 return False
 
-def sync_files(slot, srm, sav, monitoring=False):
-    color = slot_colors.get(slot.lower(), Fore.WHITE)
-    formatted_slot = f"{color}{format_game_name(slot)}{Fore.RESET}"
-    formatted_cart = f" {color}□{Fore.RESET}"
-    transferpak_suffix = get_transferpak_indicator(slot)
 
-    srm_exists = os.path.exists(srm)
-    sav_exists = os.path.exists(sav)
-
-    if monitoring:
-        timestamp = time.strftime("[%H:%M] ")
-    else:
-        timestamp = ""
+### ==================  Save History ================== ###
+
+class SaveHistory:
+    """Keeps the save versions replaced by syncs, zlib-compressed and stored once per content hash.
+
+    index.json lists the versions; blobs/<hash>.zlib holds each distinct content once.
+    Versions older than max_age_days are dropped, and the least recently used blobs are
+    evicted while there are more than max_versions versions or the blobs exceed max_bytes.
+    """
+
+    def __init__(self, path=HISTORY_DIR, max_versions=200, max_age_days=90.0, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.blob_dir = os.path.join(path, "blobs")
+        self.index_file = os.path.join(path, "index.json")
+        self.max_versions = max_versions
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self._index = None  # Loaded on first use
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, path=HISTORY_DIR):
+        history = cls(path)
+        history.apply_limits(config)
+        return history
+
+    def apply_limits(self, config):
+        """Takes the retention limits from a SyncConfig."""
+        self.max_versions = config.history_max_versions
+        self.max_age_days = config.history_max_age_days
+        self.max_bytes = int(config.history_max_mb * 1024 * 1024)
+
+    @property
+    def enabled(self):
+        return self.max_versions > 0
+
+    def _get_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {"next_id": 1, "versions": [], "blobs": {}}
+        return self._index
+
+    def _save_index(self):
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_file, self.index_file)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, f"{digest}.zlib")
+
+    def _drop_blob(self, index, digest):
+        index["blobs"].pop(digest, None)
+        index["versions"] = [v for v in index["versions"] if v["hash"] != digest]
+        try:
+            os.remove(self._blob_path(digest))
+        except OSError:
+            pass
+
+    def _enforce_limits(self, index, now):
+        """Applies the age limit, then evicts least recently used blobs until count and size fit."""
+        cutoff = now - self.max_age_days * 86400
+        index["versions"] = [v for v in index["versions"] if v["time"] >= cutoff]
+        referenced = {v["hash"] for v in index["versions"]}
+        for digest in [d for d in index["blobs"] if d not in referenced]:
+            self._drop_blob(index, digest)
+
+        total_bytes = sum(blob["bytes"] for blob in index["blobs"].values())
+        while index["blobs"] and (len(index["versions"]) > self.max_versions or total_bytes > self.max_bytes):
+            digest = min(index["blobs"], key=lambda d: index["blobs"][d]["used"])
+            total_bytes -= index["blobs"][digest]["bytes"]
+            self._drop_blob(index, digest)
+
+    def keep(self, slot, path, tag=None):
+        """Stores the current content of path as a version of slot, optionally tagged (e.g. "conflict").
+
+        Returns the version, or None.
+        """
+        if not self.enabled:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        digest = hashlib.blake2b(data).hexdigest()
+        key = normalize_save_path(path)
+        now = time.time()
+        with self._lock:
+            index = self._get_index()
+            try:
+                if digest not in index["blobs"]:
+                    os.makedirs(self.blob_dir, exist_ok=True)
+                    compressed = zlib.compress(data, 6)
+                    atomic_write(self._blob_path(digest), compressed)
+                    index["blobs"][digest] = {"bytes": len(compressed), "used": now}
+                index["blobs"][digest]["used"] = now
+
+                # A save rewritten with the same content only refreshes its latest version
+                latest = next((v for v in reversed(index["versions"]) if v["path"] == key), None)
+                if latest is not None and latest["hash"] == digest:
+                    latest["time"] = now
+                    version = latest
+                else:
+                    version = {"id": index["next_id"], "slot": slot.lower(), "path": key,
+                               "hash": digest, "size": len(data), "time": now}
+                    index["next_id"] += 1
+                    index["versions"].append(version)
+                if tag:
+                    version["tag"] = tag
+
+                self._enforce_limits(index, now)
+                self._save_index()
+            except OSError as e:
+                log(f"{Fore.YELLOW}[WARNING]{Fore.RESET} Could not add {os.path.basename(path)} to the save history: {e}")
+                return None
+        return dict(version)
+
+    def versions(self, slot=None):
+        """Returns the stored versions, oldest first, optionally only those of one slot."""
+        with self._lock:
+            versions = [dict(v) for v in self._get_index()["versions"]]
+        if slot:
+            versions = [v for v in versions if v["slot"] == slot.lower()]
+        return versions
+
+    def restore(self, version_id):
+        """Writes a stored version back over its save file, keeping the current file first.
+
+        Returns the restored version. Raises KeyError for an unknown id.
+        """
+        with self._lock:
+            index = self._get_index()
+            version = next((v for v in index["versions"] if v["id"] == version_id), None)
+            if version is None:
+                raise KeyError(version_id)
+            with open(self._blob_path(version["hash"]), "rb") as f:
+                data = zlib.decompress(f.read())
+            index["blobs"][version["hash"]]["used"] = time.time()
+            self._save_index()
+            version = dict(version)
+
+        if os.path.exists(version["path"]):
+            self.keep(version["slot"], version["path"])
+        atomic_write(version["path"], data)
+        return version
+
+
+### ==================  RetroArch Process Tracking ================== ###
+
+CONTENT_REFRESH = 2.0  # Seconds the content loaded in RetroArch is cached before its processes are inspected again
+NON_CONTENT_SUFFIXES = (".so", ".dll", ".dylib", ".cfg")  # Cores and config files on RetroArch's command line
+
+
+class RetroArchTracker:
+    """Tracks running RetroArch processes by PID and reports when the last one exits.
+
+    The full process list is only walked when no RetroArch PID is known, at most once
+    per scan_interval in the background, or on demand right before a sync, at most once
+    per refresh_interval. With
+    track_content set, it also follows which content the processes have loaded.
+    """
+
+    def __init__(self, poll_interval=1, scan_interval=30, refresh_interval=3):
+        self.poll_interval = poll_interval  # Seconds between liveness checks of known PIDs
+        self.scan_interval = scan_interval  # Seconds between fallback full process scans
+        self.refresh_interval = refresh_interval  # Minimum seconds between on-demand (refresh) scans
+        self.track_content = False  # Watch loaded_content() in the background and report changes
+        self._processes = {}  # pid -> psutil.Process
+        self._last_scan = 0
+        self._content = None  # Cached loaded_content() result
+        self._content_key = None  # PIDs the cached content was read from
+        self._content_time = 0
+        self._exit_callbacks = []
+        self._change_callbacks = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def on_exit(self, callback):
+        """Registers a callback to run when the last tracked RetroArch process exits."""
+        self._exit_callbacks.append(callback)
+
+    def on_content_change(self, callback):
+        """Registers a callback to run when running RetroArch loads other content (needs track_content)."""
+        self._change_callbacks.append(callback)
+
+    def _scan(self):
+        """Walks the process table once and records every RetroArch PID."""
+        self._last_scan = time.monotonic()
+        try:
+            for p in psutil.process_iter(["name", "status"]):
+                if p.info["status"] == psutil.STATUS_ZOMBIE:
+                    continue  # Exited, just not reaped yet
+                if p.info["name"] and "retroarch" in p.info["name"].lower():
+                    self._processes[p.pid] = p
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+    def _prune(self):
+        """Drops tracked processes that have exited (is_running also guards against PID reuse)."""
+        for pid, process in list(self._processes.items()):
+            try:
+                if process.is_running() and process.status() != psutil.STATUS_ZOMBIE:
+                    continue
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+            del self._processes[pid]
+
+    def is_running(self, refresh=False):
+        """Returns True if RetroArch is running.
+
+        With refresh, rescans when no PID is known and the last scan is older than
+        refresh_interval; otherwise only once scan_interval has passed.
+        """
+        with self._lock:
+            self._prune()
+            if not self._processes:
+                since_scan = time.monotonic() - self._last_scan
+                if since_scan >= self.scan_interval or (refresh and since_scan >= self.refresh_interval):
+                    self._scan()
+            return bool(self._processes)
+
+    def _read_content(self):
+        """Returns the lowercase names, with and without extension, of the files the RetroArch
+        processes have open.
+
+        The content on the command line only counts while it is still open: after content is
+        loaded from the menu the command line still names the game RetroArch started with.
+        Returns None if a process can't be inspected, or if none of them has a save file or
+        its command line content open, as the game being played can't be told then.
+        """
+        names = set()
+        known = False
+        for process in self._processes.values():
+            try:
+                args = process.cmdline()[1:]
+                cwd = process.cwd()
+                open_files = [f.path for f in process.open_files()]
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return None
+
+            open_paths = {os.path.normcase(path) for path in open_files}
+            for arg in args:
+                if arg.startswith("--") and "=" in arg:
+                    arg = arg.split("=", 1)[1]
+                if not arg.startswith("-") and not arg.lower().endswith(NON_CONTENT_SUFFIXES):
+                    known = known or os.path.normcase(os.path.join(cwd, arg)) in open_paths
+            known = known or any(path.lower().endswith(SAVE_SUFFIXES) for path in open_files)
+
+            for path in open_files:
+                name = os.path.basename(path).lower()
+                names.add(name)
+                names.add(os.path.splitext(name)[0])
+        return frozenset(names) if known else None
+
+    def loaded_content(self):
+        """Returns the names of the files RetroArch has open (see _read_content), or None if unknown.
+
+        Cached for CONTENT_REFRESH seconds, and read again at once when the RetroArch PIDs change.
+        Call is_running() first so the PIDs are current.
+        """
+        with self._lock:
+            key = tuple(sorted(self._processes))
+            if key != self._content_key or time.monotonic() - self._content_time >= CONTENT_REFRESH:
+                self._content = self._read_content() if key else frozenset()
+                self._content_key, self._content_time = key, time.monotonic()
+            return self._content
+
+    def run(self):
+        """Polls the known PIDs and fires the exit callbacks when RetroArch closes.
+
+        With track_content, the content change callbacks also fire when a running
+        RetroArch switches to other content.
+        """
+        was_running = self.is_running(refresh=True)
+        content = self.loaded_content() if was_running and self.track_content else None
+        while not self._stop_event.wait(self.poll_interval):
+            running = self.is_running()
+            if was_running and not running:
+                for callback in self._exit_callbacks:
+                    callback()
+            elif running and self.track_content:
+                previous, content = content, self.loaded_content()
+                if was_running and content != previous:
+                    for callback in self._change_callbacks:
+                        callback()
+            was_running = running
+
+    def stop(self):
+        self._stop_event.set()
+
+
+### ==================  Sync Scheduling ================== ###
+
+class SyncScheduler:
+    """Runs each slot's sync at its own deadline, pushing the deadline back on every new event."""
+
+    def __init__(self, sync_callback, quiet_period):
+        # quiet_period: default delay between a file event and its sync
+        self.sync_callback = sync_callback
+        self.quiet_period = quiet_period
+        self._deadlines = {}  # slot -> monotonic deadline
+        self._queue = []      # heap of (deadline, sequence, slot)
+        self._sequence = 0
+        self._held = set()    # slots waiting for RetroArch to exit
+        self._condition = threading.Condition()
+        self._running = True
+
+    def schedule(self, slot, delay=None):
+        """Sets (or moves) the slot's deadline to now + delay, defaulting to the quiet period."""
+        deadline = time.monotonic() + (self.quiet_period if delay is None else delay)
+        with self._condition:
+            self._held.discard(slot)
+            self._deadlines[slot] = deadline
+            self._sequence += 1
+            heapq.heappush(self._queue, (deadline, self._sequence, slot))
+            self._condition.notify()
+
+    def hold(self, slot):
+        """Parks a slot until release_held() is called (e.g. when RetroArch exits)."""
+        with self._condition:
+            self._held.add(slot)
+
+    def release_held(self):
+        """Schedules every held slot to run immediately."""
+        with self._condition:
+            held, self._held = self._held, set()
+        for slot in held:
+            self.schedule(slot, delay=0)
+
+    def _next_due(self):
+        """Waits for and pops the next slot whose deadline has passed. Must hold the condition."""
+        while self._running:
+            if not self._queue:
+                self._condition.wait()
+                continue
 
-    if not srm_exists:
-        print(f"{timestamp}{formatted_slot}: {Fore.LIGHTBLACK_EX}.srm file does not exist.{Fore.RESET}")
-        return
+            deadline, _, slot = self._queue[0]
+            if self._deadlines.get(slot) != deadline:
+                heapq.heappop(self._queue)  # Superseded by a later event
+                continue
 
-    if not sav_exists:
-        print(f"{timestamp}{formatted_slot}: {Fore.LIGHTGREEN_EX}No .sav file found. Creating from .srm{Fore.LIGHTBLACK_EX} - {Fore.YELLOW}SRM → SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
-        shutil.copy2(srm, sav)
-        os.utime(sav, (get_last_modified_time(srm), get_last_modified_time(srm)))
-        return
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                self._condition.wait(remaining)
+                continue
 
-    srm_time, sav_time = get_last_modified_time(srm), get_last_modified_time(sav)
+            heapq.heappop(self._queue)
+            del self._deadlines[slot]
+            return slot
+        return None
+
+    def run(self):
+        """Processes deadlines until stop() is called."""
+        while True:
+            with self._condition:
+                slot = self._next_due()
+            if slot is None:
+                return
+            try:
+                self.sync_callback(slot)
+            except Exception as e:
+                log(f"{Fore.RED}[ERROR]{Fore.RESET} Sync failed for {format_game_name(slot.name)}: {e}")
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+
+### ==================  Sync Dispatching ================== ###
+
+SYNC_WORKERS = 4  # Slots synced at the same time
+
+
+class SlotJob:
+    """A job submitted to SlotDispatcher, which callers can wait on."""
+
+    def __init__(self):
+        self.ran = False    # True once the job ran without raising
+        self.result = None  # What the job returned
+        self._done = threading.Event()
+
+    def finish(self, ran, result=None):
+        self.ran, self.result = ran, result
+        self._done.set()
+
+    def wait(self):
+        """Waits for the job and returns True if it ran without raising (False if it was dropped or failed)."""
+        self._done.wait()
+        return self.ran
+
+
+class SlotDispatcher:
+    """Runs jobs on a bounded pool of threads, with at most one job per key at a time.
+
+    Each key (a slot name) has a queue holding at most one waiting job per kind: a job
+    submitted while one of the same kind is still waiting replaces it, so a burst of
+    requests collapses into a single run, while jobs of different kinds all run in turn.
+    Jobs for different keys run concurrently on up to `workers` threads, which are
+    started on first use.
+    """
+
+    def __init__(self, workers=SYNC_WORKERS):
+        self.workers = workers
+        self._condition = threading.Condition()
+        self._ready = deque()  # Keys with a waiting job and none running
+        self._waiting = {}     # Key -> {kind: (job, [SlotJob])} not started yet, in submission order
+        self._running = set()
+        self._threads = 0
+        self._idle = 0
+        self._closed = False
+
+    def submit(self, key, job, kind=None):
+        """Queues job for key and returns a SlotJob that finishes with the run covering this request."""
+        ticket = SlotJob()
+        with self._condition:
+            if self._closed:
+                ticket.finish(False)
+                return ticket
+            queued = self._waiting.setdefault(key, {})
+            if kind in queued:
+                tickets = queued[kind][1]
+                tickets.append(ticket)
+                queued[kind] = (job, tickets)  # The latest job stands in for the queued one of its kind
+                return ticket
+            queued[kind] = (job, [ticket])
+            if len(queued) == 1 and key not in self._running:
+                self._ready.append(key)
+                self._wake_worker()
+        return ticket
+
+    def run(self, key, job, kind=None):
+        """Submits job and waits for it. Returns True if it ran without raising."""
+        return self.submit(key, job, kind).wait()
+
+    def _wake_worker(self):
+        """Hands a ready key to an idle thread, or starts one if below the limit. Must hold the condition."""
+        if self._idle:
+            self._condition.notify()
+        elif self._threads < self.workers:
+            self._threads += 1
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._ready and not self._closed:
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                if not self._ready:
+                    self._threads -= 1
+                    return
+                key = self._ready.popleft()
+                queued = self._waiting[key]
+                job, tickets = queued.pop(next(iter(queued)))
+                if not queued:
+                    del self._waiting[key]
+                self._running.add(key)
+
+            ran, result = False, None
+            try:
+                result = job()
+                ran = True
+            except Exception as e:
+                log(f"{Fore.RED}[ERROR]{Fore.RESET} Sync failed for {format_game_name(key)}: {e}")
+            finally:
+                with self._condition:
+                    self._running.discard(key)
+                    if key in self._waiting:  # More jobs for it came in while it ran
+                        self._ready.append(key)
+                        self._wake_worker()
+                for ticket in tickets:
+                    ticket.finish(ran, result)
+
+    def shutdown(self):
+        """Lets queued jobs finish, then stops the threads. Later submissions are dropped."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
 
-    if srm_time == sav_time:
-        print(f"{timestamp}{formatted_slot}: Saves are already synced{Fore.LIGHTBLACK_EX} - {Fore.RESET}SRM ↔ SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
-        return
 
-    action_color = Fore.CYAN if monitoring else Fore.LIGHTGREEN_EX
+### ================== Save Synchronization ================== ###
 
-    if srm_time > sav_time:
-        print(f"{timestamp}{formatted_slot}: {action_color}The .sav is outdated. Replacing it with .srm{Fore.LIGHTBLACK_EX} - {Fore.YELLOW}SRM → SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
-        if try_copy(srm, sav):
-            os.utime(sav, (get_last_modified_time(srm), get_last_modified_time(srm)))
+class SyncEngine:
+    """Keeps the .srm and .sav saves of one RetroArch setup in sync.
+
+    Nothing happens until sync_all() or start_monitoring() is called, so several
+    engines (e.g. one per base directory) can share a process and a RetroArchTracker.
+    """
+
+    def __init__(self, config, retroarch_tracker=None, journal=None, history=None, config_path=None):
+        self.config = config
+        self.config_path = os.path.abspath(config_path) if config_path else None  # Watched and reloaded while monitoring
+        self.slot_table = self.build_slot_table()
+        self.journal = journal or SyncJournal()  # In-memory unless a journal file is passed
+        self.history = history  # SaveHistory that keeps every overwritten save, if any
+        self._invalid_saves = {}  # Slot name -> times its sync was held for a damaged save
+        self._invalid_states = {}  # Slot name -> (srm, sav) FileStates of a damaged save no longer retried
+        self._closed_states = {}  # Normalized save path -> FileState when a writer last closed it
+        self._stable_samples = {}  # Slot name -> ((srm_state, sav_state), first seen) for stability checks
+        self._reload_lock = threading.Lock()  # One config reload at a time
+        self.dispatcher = SlotDispatcher()  # Every sync of a slot runs through here, one at a time per slot
+        self._paused = False
+        self._granularity = {}  # Save folder -> timestamp resolution in ns, probed on first use
+
+        # Only run (and stop) the tracker if we created it
+        self._owns_tracker = retroarch_tracker is None
+        self.retroarch_tracker = retroarch_tracker or RetroArchTracker()
+
+        event_delay = config.quiet_period if config.write_detection == "quiet" else STABLE_INTERVAL
+        self.scheduler = SyncScheduler(self.request_slot_sync, event_delay)
+        self.retroarch_tracker.on_exit(self.scheduler.release_held)
+        self.retroarch_tracker.on_content_change(self.scheduler.release_held)
+        if config.retroarch_hold == "in_use":
+            self.retroarch_tracker.track_content = True
+
+        self._observer = None
+        self._event_ingest = EventIngest(SaveFileEventHandler(self))  # Filters and coalesces events for the handler
+        self._watches = {}  # Normalized folder -> watchdog ObservedWatch
+        self._reload_timer = None
+        self._stop_event = threading.Event()
+
+    ### ===  Slots === ###
+
+    def get_gb_sav_filename(self, game_name):
+        """Returns the TransferPak .sav filename for a GB slot."""
+        config = self.config
+        if game_name.lower() == config.transferpak1.lower():
+            rom = config.n64_roms.get("stadium 1", "").strip()
+            return f"{rom}.sav" if rom else f"TransferPak1_{format_game_name(game_name)}.sav"
+        if game_name.lower() == config.transferpak2.lower():
+            rom = config.n64_roms.get("stadium 2", "").strip()
+            return f"{rom}.sav" if rom else f"TransferPak2_{format_game_name(game_name)}.sav"
+        slot_number = config.slot_numbers.get(game_name, 'X')
+        return f"PkmnTransferPak{slot_number} {format_game_name(game_name)}.sav"
+
+    def build_slot_table(self):
+        """Builds the slot table from the GB and GBA slots in the config."""
+        config = self.config
+        slots = []
+        for game_name, srm_filename in config.gb_slots.items():
+            slots.append(SaveSlot(
+                game_name,
+                os.path.abspath(os.path.join(config.gb_dir, f"{srm_filename}.srm")),
+                os.path.abspath(os.path.join(config.sav_dir, self.get_gb_sav_filename(game_name)))
+            ))
+        for gba_slot, rom_filename in config.gba_slots.items():
+            slots.append(SaveSlot(
+                gba_slot,
+                os.path.abspath(os.path.join(config.gba_dir, f"{rom_filename}.srm")),
+                os.path.abspath(os.path.join(config.sav_dir, f"{rom_filename}-2.sav"))
+            ))
+        return SlotTable(slots)
+
+    def get_transferpak_indicator(self, slot):
+        slot_lower = slot.lower()
+        if slot_lower == self.config.transferpak1.lower():
+            return f"{Fore.LIGHTBLACK_EX}]TransferPak{Fore.RED}1{Fore.RESET}"
+        elif slot_lower == self.config.transferpak2.lower():
+            return f"{Fore.LIGHTBLACK_EX}]TransferPak{Fore.YELLOW}2{Fore.RESET}"
+        return ""
+
+    def prepare_transferpak_roms(self):
+        """Copies GB ROMs for TransferPak slots to the TransferPak folder if needed."""
+        config = self.config
+        for pak_slot, rom_key in [(config.transferpak1, "stadium 1"), (config.transferpak2, "stadium 2")]:
+            if not pak_slot:
+                continue  # Skip empty assignments
+
+            n64_rom_name = config.n64_roms.get(rom_key, "").strip()
+            if not n64_rom_name:
+                continue
 
-    else:
-        print(f"{timestamp}{formatted_slot}: {action_color}The .srm is outdated. Replacing it with .sav{Fore.LIGHTBLACK_EX} - {Fore.YELLOW}SRM ← SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
-        if try_copy(sav, srm):
-            os.utime(srm, (get_last_modified_time(sav), get_last_modified_time(sav)))
-
-# Sync GB slots
-for game_name, srm_filename in gb_slots.items():
-    srm_path = os.path.join(gb_dir, f"{srm_filename}.srm")
-    slot_number = slot_numbers.get(game_name, 'X')
-    formatted_game_name = format_game_name(game_name)
-
-    if game_name.lower() == retroarch_transferpak1.lower():
-        rom = n64_roms.get("stadium 1", "").strip()
-        sav_filename = f"{rom}.sav" if rom else f"TransferPak1_{format_game_name(game_name)}.sav"
-    elif game_name.lower() == retroarch_transferpak2.lower():
-        rom = n64_roms.get("stadium 2", "").strip()
-        sav_filename = f"{rom}.sav" if rom else f"TransferPak2_{format_game_name(game_name)}.sav"
-    else:
-        sav_filename = f"PkmnTransferPak{slot_number} {formatted_game_name}.sav"
+            rom_output_path = os.path.join(config.sav_dir, f"{n64_rom_name}.gb")
+            if os.path.exists(rom_output_path):
+                continue  # Already present, skip
+
+            game_key = pak_slot.lower()
+            matching_prefix = config.gb_slots.get(game_key, "").lower()
+            found_rom = None
+            for ext in [".gb", ".gbc"]:
+                candidate = os.path.join(config.gbrom_dir, f"{matching_prefix}{ext}")
+                if os.path.exists(candidate):
+                    found_rom = candidate
+                    break
+
+            if found_rom:
+                shutil.copy2(found_rom, rom_output_path)
+                log(f"[INFO] Copied GB ROM for {format_game_name(pak_slot)} → {n64_rom_name}.gb")
+            else:
+                log(f"[WARNING] No GB ROM found for {format_game_name(pak_slot)} in gbrom_dir.")
+
+    ### ===  Syncing === ###
+
+    def take_snapshot(self):
+        """Reads size and mtime of every save file with one directory listing per save folder."""
+        paths = []
+        for slot in self.slot_table:
+            paths += [slot.srm, slot.sav]
+        return FileSnapshot.scan(paths)
+
+    def timestamp_granularity(self, folder):
+        """Returns the timestamp resolution of a save folder in ns, probing it once."""
+        granularity = self._granularity.get(folder)
+        if granularity is None:
+            granularity = self._granularity[folder] = probe_timestamp_granularity(folder)
+        return granularity
+
+    def timestamps_match(self, srm, sav, srm_time, sav_time):
+        """Returns True if two mtimes (ns) are equal within what the coarser of both filesystems can store."""
+        if srm_time == sav_time:
+            return True
+        tolerance = max(self.timestamp_granularity(os.path.dirname(srm)),
+                        self.timestamp_granularity(os.path.dirname(sav)))
+        return abs(srm_time - sav_time) <= tolerance
 
+    def is_in_sync(self, srm, sav, srm_state, sav_state, journal_entry):
+        """Returns True if the pair needs no sync.
 
-    sav_path = os.path.join(sav_dir, sav_filename)
-    sync_files(game_name, srm_path, sav_path)
+        A side that changed since the journal entry is always synced, even when its mtime
+        lands within the timestamp tolerance of the other one.
+        """
+        if srm_state.mtime_ns == sav_state.mtime_ns:
+            return True
+        if journal_entry is not None:
+            srm_changed, sav_changed = srm_state != journal_entry[0], sav_state != journal_entry[1]
+            if srm_changed != sav_changed:
+                return False
+            if not srm_changed:
+                return True
+        return self.timestamps_match(srm, sav, srm_state.mtime_ns, sav_state.mtime_ns)
 
-# Sync GBA slots
-for gba_slot, rom_filename in gba_slots.items():
-    srm_path = os.path.join(gba_dir, f"{rom_filename}.srm")
-    sav_path = os.path.join(sav_dir, f"{rom_filename}-2.sav")
-    sync_files(gba_slot, srm_path, sav_path)
+    def sync_files(self, slot, srm, sav, monitoring=False, snapshot=None):
+        """Replaces the older of srm/sav with the newer one, deciding from snapshot if given.
 
- 
-### ==================  File Monitoring ================== ###
+        Returns False if the sync was held because the newer save failed validation, else True.
+        """
+        color = slot_colors.get(slot.lower(), Fore.WHITE)
+        formatted_slot = f"{color}{format_game_name(slot)}{Fore.RESET}"
+        formatted_cart = f" {color}□{Fore.RESET}"
+        transferpak_suffix = self.get_transferpak_indicator(slot)
 
-# Cache for RetroArch status
-_last_check_time = 0
-_retroarch_status = False
+        if snapshot is None:
+            snapshot = FileSnapshot.stat((srm, sav))
+        srm_state, sav_state = snapshot.get(srm), snapshot.get(sav)
 
-# Optimized function to check if RetroArch is running
-def is_retroarch_running():
-    """Checks if RetroArch is running, optimized for performance with caching."""
-    global _last_check_time, _retroarch_status
-    now = time.time()
+        if monitoring:
+            timestamp = time.strftime("[%H:%M] ")
+        else:
+            timestamp = ""
 
-    # Check at most every 30 seconds
-    if now - _last_check_time < 30:
-        return _retroarch_status
+        if srm_state is None:
+            log(f"{timestamp}{formatted_slot}: {Fore.LIGHTBLACK_EX}.srm file does not exist.{Fore.RESET}")
+            return True
 
-    _last_check_time = now
-    try:
-        for p in psutil.process_iter(["name"]):
-            if p.info["name"] and "retroarch" in p.info["name"].lower():
-                _retroarch_status = True
-                return True
-    except (psutil.NoSuchProcess, psutil.AccessDenied):
-        pass
+        if sav_state is None:
+            log(f"{timestamp}{formatted_slot}: {Fore.LIGHTGREEN_EX}No .sav file found. Creating from .srm{Fore.LIGHTBLACK_EX} - {Fore.YELLOW}SRM → SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
+            if try_copy(srm, sav):
+                copy_mtime(srm, sav)
+                self.record_synced(srm, sav)
+            return True
 
-    _retroarch_status = False
-    return False
+        journal_entry = self.journal.get(srm, sav)
+        srm_changed = journal_entry is None or srm_state != journal_entry[0]
+        sav_changed = journal_entry is None or sav_state != journal_entry[1]
+        srm_time, sav_time = srm_state.mtime_ns, sav_state.mtime_ns
 
-# Optimized function to check if files should sync
-def should_sync(srm, sav):
-    """Determine if two files should be synced."""
-    current_time = time.time()
+        if self.is_in_sync(srm, sav, srm_state, sav_state, journal_entry):
+            if srm_changed or sav_changed:
+                self.journal.record(srm, sav, srm_state, sav_state, get_file_hash(srm, srm_state))
+            log(f"{timestamp}{formatted_slot}: Saves are already synced{Fore.LIGHTBLACK_EX} - {Fore.RESET}SRM ↔ SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
+            return True
 
-    # Get file modification times only once
-    srm_time, sav_time = get_last_modified_time(srm), get_last_modified_time(sav)
+        # Same bytes on both sides: only align the timestamps, skip the copy
+        if files_identical(srm, sav, srm_state, sav_state):
+            if srm_time > sav_time:
+                os.utime(sav, ns=(srm_time, srm_time))
+            else:
+                os.utime(srm, ns=(sav_time, sav_time))
+            self.record_synced(srm, sav)
+            log(f"{timestamp}{formatted_slot}: Saves are already synced{Fore.LIGHTBLACK_EX} (timestamps aligned) - {Fore.RESET}SRM ↔ SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
+            return True
 
-    # If either file does not exist, return False
-    if srm_time == 0 or sav_time == 0:
-        return False
+        action_color = Fore.CYAN if monitoring else Fore.LIGHTGREEN_EX
+        src, dst = (srm, sav) if srm_time > sav_time else (sav, srm)
+        if journal_entry is not None and srm_changed != sav_changed:
+            src, dst = (srm, sav) if srm_changed else (sav, srm)  # Only one side moved on, even if to an older mtime
+
+        # Never replace a save that passes validation with one that does not (e.g. half-written)
+        problem = self.config.validate_saves and check_save_file(slot, src)
+        if problem and not check_save_file(slot, dst):
+            holds = self._invalid_saves.get(slot, 0)
+            if holds == 0:
+                log(f"{timestamp}{formatted_slot}: {Fore.YELLOW}The {os.path.splitext(src)[1]} looks damaged ({problem}). Holding the sync until it is valid{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
+            self._invalid_saves[slot] = holds + 1
+            return False
+        self._invalid_saves.pop(slot, None)
+
+        # Both sides were played since the last sync: keep the losing side in the history, tagged as a conflict
+        conflict = journal_entry is not None and srm_changed and sav_changed and self.both_sides_edited(srm, sav, srm_state, sav_state, journal_entry[2])
+        if conflict:
+            if self.history is None or not self.history.enabled:
+                log(f"{timestamp}{formatted_slot}: {Fore.YELLOW}Both saves changed since the last sync. The newer one wins, the other is lost as the save history is off{Fore.RESET}")
+            else:
+                kept = self.history.keep(slot, dst, tag="conflict")
+                if kept is None:
+                    log(f"{Fore.RED}[ERROR]{Fore.RESET} Could not keep a copy of {dst}, skipping this sync.")
+                    return True
+                log(f"{timestamp}{formatted_slot}: {Fore.YELLOW}Both saves changed since the last sync. The newer one wins, the other is kept in the save history as #{kept['id']}{Fore.RESET}")
+
+        if src == srm:
+            log(f"{timestamp}{formatted_slot}: {action_color}The .sav is outdated. Replacing it with .srm{Fore.LIGHTBLACK_EX} - {Fore.YELLOW}SRM → SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
+        else:
+            log(f"{timestamp}{formatted_slot}: {action_color}The .srm is outdated. Replacing it with .sav{Fore.LIGHTBLACK_EX} - {Fore.YELLOW}SRM ← SAV{Fore.LIGHTBLACK_EX} - {Fore.RESET}{formatted_cart}{transferpak_suffix}")
+        if self.history is not None and not conflict:
+            self.history.keep(slot, dst)
+        if try_copy(src, dst):
+            copy_mtime(src, dst)
+            self.record_synced(srm, sav)
+        return True
+
+    def both_sides_edited(self, srm, sav, srm_state, sav_state, synced_hash):
+        """Returns True if srm and sav both differ from the content they had at the last sync."""
+        if synced_hash is None:
+            return True  # Both were modified, no hash to tell a touch from an edit
+        return get_file_hash(srm, srm_state) != synced_hash and get_file_hash(sav, sav_state) != synced_hash
+
+    def record_synced(self, srm, sav):
+        """Journals the state of a pair that was just synced."""
+        snapshot = FileSnapshot.stat((srm, sav))
+        srm_state, sav_state = snapshot.get(srm), snapshot.get(sav)
+        if srm_state is not None and sav_state is not None:
+            self.journal.record(srm, sav, srm_state, sav_state, get_file_hash(srm, srm_state))
+
+    def sync_slots(self, slots, snapshot, monitoring=False):
+        """Syncs the given slots through the dispatcher, in parallel across slots, and waits for all of them.
+
+        Each slot's output is collected while it syncs and printed in slot order. Returns the
+        names of the slots that were synced (not held for a damaged save, not failed).
+        """
+        def sync(slot):
+            lines = _log_capture.lines = []
+            try:
+                return self.sync_files(slot.name, slot.srm, slot.sav, monitoring=monitoring, snapshot=snapshot), lines
+            except Exception:
+                log_lines(lines)  # Keep what it printed before failing
+                raise
+            finally:
+                _log_capture.lines = None
+
+        # A kind of its own, so these never stand in for another caller's sync (each gets its own run and output)
+        kind = object()
+        pending = [(slot, self.dispatcher.submit(slot.name, lambda slot=slot: sync(slot), kind=kind)) for slot in slots]
+        synced = []
+        for slot, job in pending:
+            if not job.wait():
+                continue
+            result, lines = job.result
+            log_lines(lines)
+            if result is not False:
+                synced.append(slot.name)
+        self.journal.flush()
+        return synced
+
+    def sync_all(self, monitoring=False):
+        """Syncs every configured slot once, from a single snapshot of the save folders."""
+        return self.sync_slots(list(self.slot_table), self.take_snapshot(), monitoring=monitoring)
+
+    def sync_now(self, game=None):
+        """Syncs one game (or every slot) right away, even while paused. Returns the synced slot names."""
+        slots = [slot for slot in self.slot_table if game is None or slot.name == game.lower()]
+        if not slots:
+            raise ValueError(f"Unknown game: {game}")
+        snapshot = FileSnapshot.scan([path for slot in slots for path in (slot.srm, slot.sav)])
+        return self.sync_slots(slots, snapshot, monitoring=True)
+
+    def pause(self):
+        """Stops syncing on file events until resume(); slots that change meanwhile are held."""
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self.scheduler.release_held()
+
+    def status(self):
+        """Returns the state of every slot plus whether syncing is paused and RetroArch is running."""
+        snapshot = self.take_snapshot()
+        slots = {}
+        for slot in self.slot_table:
+            srm_state, sav_state = snapshot.get(slot.srm), snapshot.get(slot.sav)
+            if srm_state is None:
+                slots[slot.name] = "no .srm"
+            elif sav_state is None:
+                slots[slot.name] = "no .sav"
+            elif slot.name in self._invalid_saves:
+                slots[slot.name] = "held (damaged save)"
+            elif self.is_in_sync(slot.srm, slot.sav, srm_state, sav_state, self.journal.get(slot.srm, slot.sav)):
+                slots[slot.name] = "synced"
+            elif self.slot_in_use(slot):
+                slots[slot.name] = "pending (in use by RetroArch)"
+            else:
+                slots[slot.name] = "pending"
+        return {
+            "paused": self._paused,
+            "retroarch_running": self.retroarch_tracker.is_running(),
+            "base_dir": self.config.base_dir,
+            "events": dict(self._event_ingest.counts),
+            "slots": slots
+        }
+
+    def get_sync_wait(self, srm, sav, snapshot=None):
+        """Returns seconds left until the slot is quiet enough to sync, or None if there is nothing to sync."""
+        if snapshot is None:
+            snapshot = FileSnapshot.stat((srm, sav))
+        srm_state, sav_state = snapshot.get(srm), snapshot.get(sav)
+
+        # If either file does not exist or both are in sync, there is nothing to do
+        if srm_state is None or sav_state is None:
+            return None
+        if self.is_in_sync(srm, sav, srm_state, sav_state, self.journal.get(srm, sav)):
+            return None
+
+        if self.config.write_detection != "quiet":
+            return 0.0  # run_slot_sync waits for the write to complete instead
+        newest = max(srm_state.mtime_ns, sav_state.mtime_ns) / 1e9
+        return max(0.0, self.config.quiet_period - (time.time() - newest))
+
+    def note_write_closed(self, path):
+        """Remembers the state of a save file that a writer just closed (inotify IN_CLOSE_WRITE)."""
+        state = FileSnapshot.stat((path,)).get(path)
+        if state is not None:
+            self._closed_states[normalize_save_path(path)] = state
+
+    def time_until_written(self, slot, snapshot):
+        """Returns 0 once the newer save of a slot is completely written, else seconds until the next check.
+
+        A close-after-write event for its current state settles it at once. Without one (no
+        inotify, or a writer that keeps the file open) the pair's size and mtime must stay
+        unchanged for STABLE_INTERVAL, or the newer file's mtime must be at least that old.
+        """
+        srm_state, sav_state = snapshot.get(slot.srm), snapshot.get(slot.sav)
+        newer, newer_state = (slot.srm, srm_state) if srm_state.mtime_ns >= sav_state.mtime_ns else (slot.sav, sav_state)
+        if self._closed_states.get(normalize_save_path(newer)) == newer_state:
+            self._stable_samples.pop(slot.name, None)
+            return 0
+
+        now = time.monotonic()
+        sample = self._stable_samples.get(slot.name)
+        if sample is None or sample[0] != (srm_state, sav_state):
+            # First look at this state: its own mtime may already show it is old enough
+            if time.time() - newer_state.mtime_ns / 1e9 >= STABLE_INTERVAL:
+                self._stable_samples.pop(slot.name, None)
+                return 0
+            self._stable_samples[slot.name] = ((srm_state, sav_state), now)
+            return STABLE_INTERVAL
+        remaining = STABLE_INTERVAL - (now - sample[1])
+        if remaining > 0:
+            return remaining
+        del self._stable_samples[slot.name]
+        return 0
+
+    def slot_in_use(self, slot):
+        """Returns True if RetroArch may be using the slot's saves, so its sync has to wait.
+
+        With retroarch_hold = in_use, only a slot whose game or save RetroArch has open
+        counts, matched by file name; when that can't be told, every slot does.
+        """
+        if not self.retroarch_tracker.is_running(refresh=True):
+            return False
+        if self.config.retroarch_hold != "in_use":
+            return True
+        content = self.retroarch_tracker.loaded_content()
+        if content is None:
+            return True
+        return any(os.path.splitext(os.path.basename(path))[0].lower() in content for path in (slot.srm, slot.sav))
+
+    def request_slot_sync(self, slot):
+        """Scheduler callback: queues the slot's sync on the dispatcher without waiting for it."""
+        self.dispatcher.submit(slot.name, lambda: self._run_slot_sync(slot), kind="check")
+
+    def run_slot_sync(self, slot):
+        """Syncs the slot if it is quiet and RetroArch is closed, otherwise reschedules it. Waits until done."""
+        self.dispatcher.run(slot.name, lambda: self._run_slot_sync(slot), kind="check")
+
+    def _run_slot_sync(self, slot):
+        match = self.slot_table.lookup(slot.srm)
+        if match is None or match[0] != slot:
+            return  # Slot was removed or changed by a config reload
+        snapshot = FileSnapshot.stat((slot.srm, slot.sav))
+        states = (snapshot.get(slot.srm), snapshot.get(slot.sav))
+        if slot.name in self._invalid_states:
+            if self._invalid_states[slot.name] == states:
+                return  # Still the damaged save we stopped retrying
+            del self._invalid_states[slot.name]
+            self._invalid_saves.pop(slot.name, None)  # Changed since: check it afresh
+        if snapshot.get(slot.srm) is not None and snapshot.get(slot.sav) is None:
+            wait = 0  # No .sav yet (e.g. a TransferPak reassigned by a reload): create it, as at startup
+        else:
+            wait = self.get_sync_wait(slot.srm, slot.sav, snapshot)
+            if wait is None:
+                return  # Already synced or missing the .srm
+            if wait == 0 and self.config.write_detection != "quiet":
+                wait = self.time_until_written(slot, snapshot)
+        if wait > 0:
+            self.scheduler.schedule(slot, delay=wait)
+            return
+        if self._paused or self.slot_in_use(slot):
+            self.scheduler.hold(slot)
+            return
+        if not self.sync_files(slot.name, slot.srm, slot.sav, monitoring=True, snapshot=snapshot):
+            # Damaged save: retry with backoff, it may just not be fully written yet
+            delay = INVALID_SAVE_RETRY * 2 ** (self._invalid_saves.get(slot.name, 1) - 1)
+            if delay <= INVALID_SAVE_RETRY_MAX:
+                self.scheduler.schedule(slot, delay=delay)
+            else:
+                self._invalid_states[slot.name] = states
+                color = slot_colors.get(slot.name, Fore.WHITE)
+                log(f"{time.strftime('[%H:%M] ')}{color}{format_game_name(slot.name)}{Fore.RESET}: {Fore.YELLOW}The save still looks damaged. Waiting for it to change before trying again.{Fore.RESET}")
+        self.journal.flush()
+
+    ### ===  Monitoring === ###
+
+    def periodic_sync_pass(self):
+        """Schedules every out-of-sync slot once."""
+        snapshot = self.take_snapshot()
+        for slot in self.slot_table:
+            wait = self.get_sync_wait(slot.srm, slot.sav, snapshot)
+            if wait is not None:
+                self.scheduler.schedule(slot, delay=wait)
+
+    def periodic_sync_check(self, interval=120):
+        """Periodically schedules out-of-sync slots in case an event was missed by watchdog."""
+        while not self._stop_event.wait(interval):
+            self.periodic_sync_pass()
+
+    def start_monitoring(self, periodic_interval=120):
+        """Starts watching the save folders in the background. Raises FileNotFoundError for a missing folder."""
+        self._start_observer()
+
+        # Start the scheduler, RetroArch tracker and periodic safety net in background
+        threading.Thread(target=self.scheduler.run, daemon=True).start()
+        if self._owns_tracker:
+            threading.Thread(target=self.retroarch_tracker.run, daemon=True).start()
+        threading.Thread(target=self.periodic_sync_check, args=(periodic_interval,), daemon=True).start()
+
+    def _watched_folders(self):
+        """Returns {normalized folder: (name, folder)} for every folder that needs a watch."""
+        config = self.config
+        folders = [
+            ("GB Save Directory", config.gb_dir),
+            ("GBA Save Directory", config.gba_dir),
+            ("TransferPak Save Directory", config.sav_dir)
+        ]
+        if self.config_path:
+            folders.append(("Config Directory", os.path.dirname(self.config_path)))
+        return {os.path.normcase(os.path.abspath(path)): (name, path) for name, path in reversed(folders)}
+
+    def _update_watches(self):
+        """Watches the folders of the current config, rescheduling only those that changed."""
+        wanted = self._watched_folders()
+        for key, (name, path) in wanted.items():
+            if key not in self._watches and not os.path.exists(path):
+                raise FileNotFoundError(f"Failed to monitor {name}: {path}")
+
+        removed = [key for key in self._watches if key not in wanted]
+        for key in removed:
+            self._observer.unschedule(self._watches.pop(key))
+        added = [key for key in wanted if key not in self._watches]
+        for key in added:
+            self._watches[key] = self._observer.schedule(self._event_ingest, path=wanted[key][1], recursive=False)
+        return len(removed) + len(added)
+
+    def _start_observer(self):
+        from watchdog.observers import Observer  # File monitoring
+
+        # Schedule observers ONLY on directories containing save files (and the config file)
+        self._observer = Observer()
+        self._watches = {}
+        try:
+            self._update_watches()
+        except FileNotFoundError:
+            self._observer = None
+            raise
+
+        self.prepare_transferpak_roms()
+        self._observer.start()
+
+    def _stop_observer(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+            self._watches = {}
+
+    def reload(self, config):
+        """Switches to a new config in place and returns a summary of what changed.
+
+        Only slots that are new or whose files changed are scheduled for a sync (which waits
+        while paused or while RetroArch uses them, like any event), and only watches on
+        folders that changed are rescheduled; events keep flowing for everything else.
+        Raises FileNotFoundError (keeping the old config) if a new save folder is missing.
+        """
+        with self._reload_lock:
+            old_config, old_table = self.config, self.slot_table
+            old_slots = {slot.name: slot for slot in old_table}
+            self.config = config
+            self.slot_table = self.build_slot_table()
+
+            watches_changed = 0
+            if self._observer is not None:
+                try:
+                    watches_changed = self._update_watches()
+                except FileNotFoundError:
+                    self.config, self.slot_table = old_config, old_table
+                    raise
+
+            self._event_ingest.update_names()
+            self.scheduler.quiet_period = config.quiet_period if config.write_detection == "quiet" else STABLE_INTERVAL
+            if config.retroarch_hold == "in_use":
+                self.retroarch_tracker.track_content = True
+            if self.history is not None:
+                self.history.apply_limits(config)
+
+            changed = [slot for slot in self.slot_table if old_slots.get(slot.name) != slot]
+            new_names = {slot.name for slot in self.slot_table}
+            removed = [name for name in old_slots if name not in new_names]
+            for name in [slot.name for slot in changed] + removed:
+                self._invalid_saves.pop(name, None)
+                self._invalid_states.pop(name, None)
+                self._stable_samples.pop(name, None)
+
+            if changed:
+                if self._observer is not None:
+                    self.prepare_transferpak_roms()
+                for slot in changed:
+                    self.scheduler.schedule(slot, delay=0)
+
+        return {"changed": [slot.name for slot in changed], "removed": removed, "watches_changed": watches_changed}
+
+    def reload_config_file(self):
+        """Re-reads config_path and reloads. Raises ConfigError or FileNotFoundError."""
+        summary = self.reload(SyncConfig.from_file(self.config_path))
+        if summary["changed"] or summary["removed"] or summary["watches_changed"]:
+            log(f"\n{Fore.LIGHTMAGENTA_EX}Configuration reloaded: {len(summary['changed'])} slot(s) new or changed, "
+                f"{len(summary['removed'])} removed, {summary['watches_changed']} folder watch(es) updated.{Fore.RESET}")
+        return summary
+
+    def config_file_changed(self):
+        """Called for every event on the config file; reloads once it has been quiet for a moment."""
+        if self._reload_timer is not None:
+            self._reload_timer.cancel()
+        self._reload_timer = threading.Timer(STABLE_INTERVAL, self._reload_after_change)
+        self._reload_timer.daemon = True
+        self._reload_timer.start()
+
+    def _reload_after_change(self):
+        try:
+            self.reload_config_file()
+        except (ConfigError, FileNotFoundError) as e:
+            log(f"{Fore.YELLOW}[WARNING]{Fore.RESET} Config change not applied: {e}")
+
+    def stop(self):
+        """Stops monitoring. Safe to call more than once."""
+        self._stop_event.set()
+        if self._reload_timer is not None:
+            self._reload_timer.cancel()
+        self.scheduler.stop()
+        self.dispatcher.shutdown()
+        if self._owns_tracker:
+            self.retroarch_tracker.stop()
+        self._stop_observer()
 
-    # If timestamps match, they're already synced
-    if srm_time == sav_time:
-        return False
 
-    # Don't sync if RetroArch is running
-    if is_retroarch_running():
-        return False
+### ==================  File Monitoring ================== ###
 
-    # Only sync if no changes in the last 30 seconds
-    return (current_time - max(srm_time, sav_time)) >= 30
+EVENT_COALESCE_WINDOW = 0.25  # Seconds during which repeated write events on one file count as one
+SAVE_SUFFIXES = (".srm", ".sav")
+HANDLED_EVENTS = ("modified", "created", "closed", "moved")  # Opens, deletes etc. are of no use to the handler
+
+
+class EventIngest:
+    """Sits between the watchdog observer and SaveFileEventHandler and thins out the event stream.
+
+    Events of a type the handler ignores, or on anything but a slot's save files or the
+    config file, are dropped by file name, without normalizing the path. Modified/created
+    events on a file within EVENT_COALESCE_WINDOW of the last one passed on are dropped
+    too: the sync re-checks the files before copying,
+    so only the first event of a burst is needed. Close and rename events always pass, as
+    they mark a finished write. `counts` keeps raw versus forwarded event totals.
+    """
+
+    def __init__(self, handler, window=EVENT_COALESCE_WINDOW):
+        self.handler = handler
+        self.window = window
+        self.counts = {"raw": 0, "ignored": 0, "coalesced": 0, "forwarded": 0}
+        self._last_forwarded = {}  # Raw path -> monotonic time its last write event was passed on
+        self._names = frozenset()  # Lowercase file names whose events pass
+        self.update_names()
+
+    def update_names(self):
+        """Rebuilds the names to let through from the engine's slots and config file (call after a reload)."""
+        engine = self.handler.engine
+        names = {os.path.basename(path).lower() for slot in engine.slot_table for path in (slot.srm, slot.sav)}
+        if engine.config_path:
+            names.add(os.path.basename(engine.config_path).lower())
+        self._names = frozenset(names)
+
+    def is_relevant(self, path):
+        """Cheap name check: True for the slots' save files and the config file."""
+        name = path.rpartition(os.sep)[2]  # Faster than os.path.basename, this runs for every event
+        if os.altsep:
+            name = name.rpartition(os.altsep)[2]
+        return name.lower() in self._names
+
+    def dispatch(self, event):
+        """Called by the watchdog observer for every event."""
+        self.counts["raw"] += 1
+        dest_path = getattr(event, "dest_path", "")
+        relevant = self.is_relevant(event.src_path) or (dest_path and self.is_relevant(dest_path))
+        if event.is_directory or event.event_type not in HANDLED_EVENTS or not relevant:
+            self.counts["ignored"] += 1
+            return
 
-class SaveFileEventHandler(FileSystemEventHandler):
-    """Handles file modifications and triggers sync when needed."""
+        if event.event_type in ("modified", "created"):
+            now = time.monotonic()
+            last = self._last_forwarded.get(event.src_path)
+            if last is not None and now - last < self.window:
+                self.counts["coalesced"] += 1
+                return
+            if len(self._last_forwarded) >= 1024:
+                self._last_forwarded = {path: t for path, t in self._last_forwarded.items() if now - t < self.window}
+            self._last_forwarded[event.src_path] = now
+
+        self.counts["forwarded"] += 1
+        self.handler.dispatch(event)
+
+
+class SaveFileEventHandler:
+    """Handles file events and schedules a sync for the matching slot.
+
+    Implements watchdog's handler interface (dispatch) directly instead of subclassing
+    FileSystemEventHandler, so watchdog is only imported once monitoring starts.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def dispatch(self, event):
+        """Called by the watchdog observer for every event."""
+        config_path = self.engine.config_path
+        if config_path and not event.is_directory:
+            paths = (event.src_path, getattr(event, "dest_path", "") or event.src_path)
+            if normalize_save_path(config_path) in map(normalize_save_path, paths):
+                if event.event_type in ("modified", "created", "moved", "closed"):
+                    self.engine.config_file_changed()
+                return
+
+        if event.event_type in ("modified", "created"):
+            self.on_modified(event)
+        elif event.event_type == "closed":
+            self.on_closed(event.src_path, event)
+        elif event.event_type == "moved":
+            self.on_closed(event.dest_path, event)  # Saved to a temp file and renamed into place
 
     def on_modified(self, event):
         """Triggered when a save file (.srm or .sav) is modified."""
         if event.is_directory:
             return
 
-        filepath = os.path.normcase(os.path.abspath(event.src_path))
-
-        # Track whether we already handled a match to prevent duplicate processing
-        handled = False
-
-        # Check GB save files
-        for game_name, srm_filename in gb_slots.items():
-            srm_path = os.path.normcase(os.path.abspath(os.path.join(gb_dir, f"{srm_filename}.srm")))
-            slot_number = slot_numbers.get(game_name, 'X')
-            formatted_game_name = format_game_name(game_name)
-            sav_filename = f"PkmnTransferPak{slot_number} {formatted_game_name}.sav"
-
-            if game_name == retroarch_transferpak1.lower():
-                sav_filename = f"{n64_roms.get('stadium 1', '')}.sav"
-            elif game_name == retroarch_transferpak2.lower():
-                sav_filename = f"{n64_roms.get('stadium 2', '')}.sav"
-
-            sav_path = os.path.normcase(os.path.abspath(os.path.join(sav_dir, sav_filename)))
-
-            if filepath in [srm_path, sav_path] and should_sync(srm_path, sav_path):
-                if not handled:
-                    sync_files(game_name, srm_path, sav_path, monitoring=True)
-                    handled = True
-                return  # Exit after first sync
-
-        # Check GBA save files
-        for gba_slot, rom_filename in gba_slots.items():
-            srm_path = os.path.normcase(os.path.abspath(os.path.join(gba_dir, f"{rom_filename}.srm")))
-            sav_filename = f"{rom_filename}-2.sav"
-            sav_path = os.path.normcase(os.path.abspath(os.path.join(sav_dir, sav_filename)))
-
-            if filepath in [srm_path, sav_path] and should_sync(srm_path, sav_path):
-                if not handled:
-                    sync_files(gba_slot, srm_path, sav_path, monitoring=True)
-                    handled = True
-                return  # Exit after first sync
-
-
-# Initialize and start the watchdog observer
-observer = Observer()
-save_event_handler = SaveFileEventHandler()
-
-# Schedule observers ONLY on directories containing save files
-for name, path in [
-    ("GB Save Directory", gb_dir),
-    ("GBA Save Directory", gba_dir),
-    ("TransferPak Save Directory", sav_dir)
-]:
-    try:
-        if not os.path.exists(path):
-            raise FileNotFoundError(f"{Fore.RED}[ERROR]{Fore.RESET} '{path}' does not exist.")
-        observer.schedule(save_event_handler, path=path, recursive=False)
-    except Exception as e:
-        print(f"\n{Fore.RED}[ERROR]{Fore.RESET} Failed to monitor {name}: {path}")
-        input("-> Please check your configuration and make sure the folder exists.")
-        sys.exit(1)
+        match = self.engine.slot_table.lookup(event.src_path)
+        if match is None:
+            return  # Not one of our save files
 
-prepare_transferpak_roms()
-observer.start()
+        slot, _ = match
+        self.engine.scheduler.schedule(slot)
 
-print()
-print(f"{Fore.LIGHTMAGENTA_EX}Monitoring savefiles for changes...{Fore.RESET}")
+    def on_closed(self, path, event):
+        """Triggered when a save file is completely written (closed after writing, or renamed into place)."""
+        if event.is_directory:
+            return
 
-def periodic_sync_check(interval=120):
-    """Periodically checks save files for syncing in case missed by watchdog."""
-    last_synced = {}  # Dictionary to track last sync times for each file
+        match = self.engine.slot_table.lookup(path)
+        if match is None:
+            return
 
-    while True:
-        time.sleep(interval)
+        slot, _ = match
+        if self.engine.config.write_detection == "quiet":
+            self.engine.scheduler.schedule(slot)
+            return
+        self.engine.note_write_closed(path)
+        self.engine.scheduler.schedule(slot, delay=0)
+
+
+### ==================  Main ================== ###
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Keeps RetroArch .srm saves and TransferPak .sav files in sync.")
+    parser.add_argument("--once", action="store_true",
+                        help="sync every slot once and exit (no tray, no monitoring)")
+    parser.add_argument("--history", nargs="?", const="", metavar="GAME",
+                        help="list the save versions kept in the history (optionally of one game) and exit")
+    parser.add_argument("--restore", type=int, metavar="ID",
+                        help="write a version from the history back over its save file and exit")
+    parser.add_argument("--send", nargs="+", metavar="COMMAND",
+                        help="send a command to the running instance and exit: "
+                             "status, sync-now [GAME], reload-config, pause or resume")
+    return parser.parse_args(argv)
+
+def run_command(words):
+    """Sends a control command to the running instance, prints the reply and returns an exit code."""
+    enable_console_colors()
+    try:
+        reply = send_command(" ".join(words), timeout=60.0)
+    except OSError as e:
+        print(f"{Fore.RED}[ERROR]{Fore.RESET} PokemonStadiumSync is not running ({e}).")
+        return 2
+
+    if not reply.get("ok"):
+        print(f"{Fore.RED}[ERROR]{Fore.RESET} {reply.get('error', 'Command failed')}")
+        return 1
+
+    if "slots" in reply:
+        print(f"Base directory: {reply['base_dir']}")
+        print(f"Paused: {'yes' if reply['paused'] else 'no'}, RetroArch running: {'yes' if reply['retroarch_running'] else 'no'}")
+        events = reply.get("events")
+        if events:
+            print(f"File events: {events['raw']} received, {events['ignored']} ignored, "
+                  f"{events['coalesced']} coalesced, {events['forwarded']} handled")
+        for slot, state in reply["slots"].items():
+            color = slot_colors.get(slot, Fore.WHITE)
+            print(f"  {color}{format_game_name(slot):<10}{Fore.RESET} {state}")
+    elif "synced" in reply:
+        if not reply["synced"]:
+            print(f"{Fore.YELLOW}[WARNING]{Fore.RESET} Nothing was synced (held for a damaged save or failed, see the running instance's output).")
+            return 1
+        print(f"[INFO] Synced {', '.join(format_game_name(slot) for slot in reply['synced'])}.")
+    else:
+        print(f"[INFO] {words[0]}: done.")
+    return 0
 
-        # Periodically check GB save files
-        for game_name, srm_filename in gb_slots.items():
-            srm_path = os.path.abspath(os.path.join(gb_dir, f"{srm_filename}.srm"))
-            slot_number = slot_numbers.get(game_name, 'X')
-            formatted_game_name = format_game_name(game_name)
-            sav_filename = f"PkmnTransferPak{slot_number} {formatted_game_name}.sav"
+def open_history(config_file=CONFIG_FILE):
+    """Returns the SaveHistory with the limits from the config file (defaults if it can't be read)."""
+    try:
+        return SaveHistory.from_config(SyncConfig.from_file(config_file))
+    except ConfigError:
+        return SaveHistory()
+
+def list_history(game="", config_file=CONFIG_FILE):
+    """Prints the versions kept in the save history and returns an exit code."""
+    enable_console_colors()
+    versions = open_history(config_file).versions(game)
+    if not versions:
+        print(f"No saved versions{f' for {format_game_name(game)}' if game else ''}.")
+        return 0
+
+    for version in versions:
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(version["time"]))
+        color = slot_colors.get(version["slot"], Fore.WHITE)
+        tag = f"  {Fore.YELLOW}({version['tag']}){Fore.RESET}" if version.get("tag") else ""
+        print(f"{Fore.LIGHTBLACK_EX}#{version['id']:<5}{Fore.RESET} {when}  {color}{format_game_name(version['slot']):<10}{Fore.RESET} "
+              f"{version['size'] // 1024:>4} KB  {Fore.LIGHTBLACK_EX}{version['hash'][:12]}  {os.path.basename(version['path'])}{Fore.RESET}{tag}")
+    return 0
+
+def restore_version(version_id, config_file=CONFIG_FILE):
+    """Restores a version from the save history and returns an exit code."""
+    enable_console_colors()
+    try:
+        version = open_history(config_file).restore(version_id)
+    except KeyError:
+        print(f"{Fore.RED}[ERROR]{Fore.RESET} No version #{version_id} in the save history.")
+        return 1
+    except OSError as e:
+        print(f"{Fore.RED}[ERROR]{Fore.RESET} Could not restore version #{version_id}: {e}")
+        return 1
+
+    print(f"[INFO] Restored {format_game_name(version['slot'])} #{version_id} → {version['path']}")
+    print("[INFO] The other save file of this game is updated on the next sync.")
+    return 0
+
+def run_once(config_file=CONFIG_FILE):
+    """Syncs every slot and returns an exit code. Only needs the standard library and psutil."""
+    enable_console_colors()
 
-            if game_name == retroarch_transferpak1.lower():
-                sav_filename = f"{n64_roms.get('stadium 1', '')}.sav"
-            elif game_name == retroarch_transferpak2.lower():
-                sav_filename = f"{n64_roms.get('stadium 2', '')}.sav"
+    try:
+        config = SyncConfig.from_file(config_file)
+    except ConfigError as e:
+        print(f"{Fore.RED}[ERROR]{Fore.RESET} {e}")
+        return 1
 
-            sav_path = os.path.abspath(os.path.join(sav_dir, sav_filename))
+    SyncEngine(config, journal=SyncJournal(JOURNAL_FILE), history=SaveHistory.from_config(config)).sync_all()
+    return 0
 
-            # Ensure last_sync_time is set before checking it
-            last_sync_time = last_synced.get(game_name, 0)
+def main(argv=None):
+    global whnd
 
-            if should_sync(srm_path, sav_path) and (time.time() - last_sync_time > 5):
-                sync_files(game_name, srm_path, sav_path, monitoring=True)
-                last_synced[game_name] = time.time()  # Update last sync time
+    args = parse_args(argv)
+    if args.once:
+        sys.exit(run_once())
+    if args.history is not None:
+        sys.exit(list_history(args.history))
+    if args.restore is not None:
+        sys.exit(restore_version(args.restore))
+    if args.send:
+        sys.exit(run_command(args.send))
+
+    # Initialize Colorama for colored terminal output
+    from colorama import init
+    init(autoreset=True)
+
+    # Windows-Specific Console Handling
+    if sys.platform == "win32":
+        whnd = ctypes.windll.kernel32.GetConsoleWindow()
+
+    # Load Configuration
+    try:
+        config = SyncConfig.from_file(CONFIG_FILE)
+    except ConfigError as e:
+        print(f"\n{Fore.RED}[ERROR]{Fore.RESET} {e}")
+        input("-> Please run the configuration tool (UI) to set it up before using this sync script.")
+        sys.exit(1)
 
-        # Periodically check GBA save files
-        for gba_slot, rom_filename in gba_slots.items():
-            srm_path = os.path.abspath(os.path.join(gba_dir, f"{rom_filename}.srm"))
-            sav_filename = f"{rom_filename}-2.sav"
-            sav_path = os.path.abspath(os.path.join(sav_dir, sav_filename))
+    # Hide terminal immediately if run_minimized is True
+    if config.run_minimized and sys.platform == "win32" and whnd:
+        ctypes.windll.user32.ShowWindow(whnd, 0)
 
-            # Ensure last_sync_time is set before checking it
-            last_sync_time = last_synced.get(gba_slot, 0)
+    # Handle console minimization
+    if sys.platform == "win32":
+        if whnd:
+            try:
+                tray_thread = threading.Thread(target=setup_tray, daemon=True)
+                tray_thread.start()
+            except Exception as e:
+                print(f"Error starting system tray: {e}")
 
-            if should_sync(srm_path, sav_path) and (time.time() - last_sync_time > 5):
-                sync_files(gba_slot, srm_path, sav_path, monitoring=True)
-                last_synced[gba_slot] = time.time()  # Update last sync time
+    # Take over from an instance that is already running
+    try:
+        control = ControlServer(CONFIG_FILE, control_token())
+        acquired = control.acquire()
+    except OSError as e:
+        print(f"{Fore.YELLOW}[WARNING]{Fore.RESET} No control token or instance lock ({e}), running without the single-instance guard.")
+        control = None
+    else:
+        if not acquired:
+            print(f"{Fore.RED}[ERROR]{Fore.RESET} Another instance is monitoring {CONFIG_FILE} and did not hand over.")
+            input("-> Close it and start this again.")
+            sys.exit(1)
+        if not control.listening:
+            print(f"{Fore.YELLOW}[WARNING]{Fore.RESET} Port {control.port} is in use by another program, --send commands won't reach this instance.")
+
+    engine = SyncEngine(config, journal=SyncJournal(JOURNAL_FILE), history=SaveHistory.from_config(config),
+                        config_path=CONFIG_FILE)
+
+    if control is not None:
+        def hand_over():
+            engine.stop()
+            control.close()
+            os._exit(0)
+
+        def reload_config():
+            try:
+                return {"ok": True, **engine.reload_config_file()}
+            except (ConfigError, FileNotFoundError) as e:
+                return {"ok": False, "error": str(e)}
+
+        def set_paused(paused):
+            if paused:
+                engine.pause()
+            else:
+                engine.resume()
+            log(f"\n{Fore.LIGHTMAGENTA_EX}Syncing {'paused' if paused else 'resumed'}.{Fore.RESET}")
+            return {"ok": True}
+
+        control.on_handover = hand_over
+        control.handlers.update({
+            "status": lambda: {"ok": True, **engine.status()},
+            "sync-now": lambda game=None: {"ok": True, "synced": engine.sync_now(game)},
+            "reload-config": reload_config,
+            "pause": lambda: set_paused(True),
+            "resume": lambda: set_paused(False)
+        })
+        if control.listening:
+            threading.Thread(target=control.serve, daemon=True).start()
+    engine.sync_all()
+
+    try:
+        engine.start_monitoring()
+    except FileNotFoundError as e:
+        print(f"\n{Fore.RED}[ERROR]{Fore.RESET} {e}")
+        input("-> Please check your configuration and make sure the folder exists.")
+        sys.exit(1)
 
+    print()
+    print(f"{Fore.LIGHTMAGENTA_EX}Monitoring savefiles for changes...{Fore.RESET}")
 
+    ### ==================  End print ================== ###
+    if config.stay_open:
+        input()
+    engine.stop()
 
-# Start periodic checker in background
-periodic_thread = threading.Thread(target=periodic_sync_check, args=(30,), daemon=True)
-periodic_thread.start()
 
-### ==================  End print ================== ###
-if stay_open:
-    input()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,31 @@
 ### ==================  Import Dependencies ================== ###
 
+import bisect
 import configparser
+import json
 import os
+import queue
+import re
 import sys
+import threading
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog
 
 CONFIG_FILE = "PokemonStadiumSync.cfg"
+INDEX_CACHE_FILE = "PokemonStadiumSync.index.json"  # File index kept between searches
+INDEX_CACHE_VERSION = 1
+
+# RetroArch folders that never hold saves or ROMs, skipped when searching.
+# Can be overridden with "prune_dirs" (comma separated) under [Search] in the config.
+SEARCH_PRUNE_DIRS = ("thumbnails", "shaders", "assets", "cores", "overlays", "autoconfig", "database",
+                     "filters", "info", "logs", "screenshots", "cheats", "layouts", "playlists")
+SEARCH_MAX_DEPTH = 6  # How many folders deep below base_dir to search ("max_depth" under [Search])
+SEARCH_WORKERS = 8    # Top-level folders scanned in parallel
+SEARCH_MATCH_EXTENSIONS = (".srm", ".n64", ".z64")  # Files counted as matches in the search progress
+STATUS_DEBOUNCE_MS = 150  # Wait this long after the last edit before re-checking paths
+STATUS_CACHE_TTL = 2.0    # Seconds a folder listing is trusted for the status icons
 
 DEFAULT_CONFIG = {
     "General": {"stay_open": "True", "run_minimized": "False"},
@@ -97,7 +116,7 @@ def browse_path(entry_key):
         entries[entry_key].delete(0, tk.END)
         entries[entry_key].insert(0, normalized_path)
 
-        update_status_icons()
+        schedule_status_update(force=True)  # The dialog may have created files or folders
         detect_and_set_base_directory(last_found)
 
         if last_found_type == "subfolder":
@@ -106,90 +125,397 @@ def browse_path(entry_key):
         auto_populate_subfolder()
 
 ### ==================  Search Button ================== ###
-def search_for_files():
-    base_dir = entries["base_dir"].get().strip()
-    if not os.path.exists(base_dir):
-        return print("❌ Search Aborted: Base directory does not exist.")
+def load_index_cache(base_dir, cache_file=INDEX_CACHE_FILE):
+    """Returns the cached directory entries for base_dir, or {} if there is no usable cache."""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get("version") != INDEX_CACHE_VERSION or cache.get("base_dir") != os.path.normpath(base_dir):
+        return {}
+    return cache.get("dirs", {})
+
+def save_index_cache(base_dir, dirs, cache_file=INDEX_CACHE_FILE):
+    """Writes the directory entries to disk, replacing the old cache atomically."""
+    cache = {"version": INDEX_CACHE_VERSION, "base_dir": os.path.normpath(base_dir), "dirs": dirs}
+    tmp_file = f"{cache_file}.tmp"
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"⚠️ Could not save file index: {e}")
+
+# Directory entries already loaded this session, keyed by (base_dir, cache_file)
+_loaded_indexes = {}
+
+class SearchCancelled(Exception):
+    """Raised inside a search when its cancel event is set."""
+
+def _count_matches(files):
+    """Counts the Pokemon saves and Stadium ROMs among a folder's files."""
+    return sum(1 for file in files if file.lower().startswith("pokemon") and file.lower().endswith(SEARCH_MATCH_EXTENSIONS))
+
+def _refresh_subtree(base_dir, top_dir, dirs, prune_dirs, max_depth, progress=None, cancel_event=None):
+    """Refreshes the entries for top_dir and the folders below it. Returns (entries, changed)."""
+    refreshed = {}
+    changed = False
+    pending = [top_dir]
+
+    while pending:
+        if cancel_event is not None and cancel_event.is_set():
+            raise SearchCancelled()
+
+        rel_dir = pending.pop()
+        folder = os.path.join(base_dir, rel_dir) if rel_dir else base_dir
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            continue  # Folder was removed since the last scan
+
+        entry = dirs.get(rel_dir)
+        if entry is None or entry["mtime_ns"] != mtime_ns:
+            files, subdirs = [], []
+            try:
+                with os.scandir(folder) as it:
+                    for dir_entry in it:
+                        try:
+                            if dir_entry.is_dir(follow_symlinks=False):
+                                subdirs.append(dir_entry.name)
+                            elif dir_entry.is_file():
+                                files.append(dir_entry.name)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            # A new mtime alone (e.g. our own cache file being rewritten) is not worth saving
+            if entry is None or entry["files"] != files or entry["subdirs"] != subdirs:
+                changed = True
+            entry = {"mtime_ns": mtime_ns, "files": files, "subdirs": subdirs}
+
+        refreshed[rel_dir] = entry
+        if progress is not None:
+            progress(1, _count_matches(entry["files"]))
+
+        depth = rel_dir.count(os.sep) + 1 if rel_dir else 0
+        if depth < max_depth:
+            pending.extend(os.path.join(rel_dir, name) if rel_dir else name
+                           for name in entry["subdirs"] if name.lower() not in prune_dirs)
+
+    return refreshed, changed
+
+def refresh_directory_index(base_dir, dirs, prune_dirs=SEARCH_PRUNE_DIRS, max_depth=SEARCH_MAX_DEPTH,
+                            workers=SEARCH_WORKERS, progress=None, cancel_event=None):
+    """Returns (entries, changed) with up-to-date entries {relative dir: {mtime_ns, files, subdirs}} under base_dir.
+
+    A folder's mtime only changes when entries are added, removed or renamed in it, so
+    folders with an unchanged mtime reuse their cached listing and cost a single stat.
+    Folders named in prune_dirs and folders deeper than max_depth are skipped, and each
+    top-level folder is scanned on its own thread.
+
+    progress(folders, matches) is called (from any thread) after each folder, and
+    SearchCancelled is raised once cancel_event is set.
+    """
+    prune_dirs = {name.lower() for name in prune_dirs}
+
+    # List base_dir itself, then hand each top-level folder to the pool
+    refreshed, changed = _refresh_subtree(base_dir, "", dirs, prune_dirs, 0, progress, cancel_event)
+    if "" not in refreshed or max_depth < 1:
+        return refreshed, changed or len(refreshed) != len(dirs)
+
+    top_dirs = [name for name in refreshed[""]["subdirs"] if name.lower() not in prune_dirs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda name: _refresh_subtree(base_dir, name, dirs, prune_dirs, max_depth,
+                                                         progress, cancel_event), top_dirs)
+        for subtree, subtree_changed in results:
+            refreshed.update(subtree)
+            changed = changed or subtree_changed
+
+    # Folders that disappeared (or are now pruned) also count as a change
+    return refreshed, changed or len(refreshed) != len(dirs)
+
+def get_search_settings():
+    """Reads the optional [Search] settings from the config file: (prune_dirs, max_depth)."""
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+    prune_dirs = config.get("Search", "prune_dirs", fallback=None)
+    if prune_dirs is None:
+        prune_dirs = SEARCH_PRUNE_DIRS
+    else:
+        prune_dirs = tuple(name.strip() for name in prune_dirs.split(",") if name.strip())
+    try:
+        max_depth = config.getint("Search", "max_depth", fallback=SEARCH_MAX_DEPTH)
+    except ValueError:
+        max_depth = SEARCH_MAX_DEPTH
+    return prune_dirs, max_depth
+
+def index_files(base_dir, cache_file=INDEX_CACHE_FILE, prune_dirs=SEARCH_PRUNE_DIRS, max_depth=SEARCH_MAX_DEPTH,
+                progress=None, cancel_event=None):
+    """Indexes base_dir and returns (file_index, folder_counts).
+
+    file_index maps each lowercase filename to (relative path, filename) and
+    folder_counts counts the GB ROMs found in each folder. The folder listing is
+    cached in cache_file and only changed folders are rescanned; pass
+    cache_file=None to always scan everything. prune_dirs and max_depth limit
+    which folders are searched; progress and cancel_event are passed on to
+    refresh_directory_index.
+    """
+    cached_dirs = {}
+    if cache_file:
+        key = (os.path.normpath(base_dir), cache_file)
+        cached_dirs = _loaded_indexes.get(key)
+        if cached_dirs is None:
+            cached_dirs = load_index_cache(base_dir, cache_file)
+
+    dirs, changed = refresh_directory_index(base_dir, cached_dirs, prune_dirs, max_depth,
+                                            progress=progress, cancel_event=cancel_event)
+    if cache_file:
+        _loaded_indexes[key] = dirs
+        if changed:
+            save_index_cache(base_dir, dirs, cache_file)
 
     file_index, folder_counts = {}, {}
-
-    # Indexing files
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            rel_path = os.path.relpath(os.path.join(root, file), base_dir).replace("\\", "/")
-            file_index[file.lower()] = (rel_path, file)
+    for rel_dir, entry in dirs.items():
+        rel_prefix = rel_dir.replace("\\", "/") + "/" if rel_dir else ""
+        for file in entry["files"]:
+            file_index[file.lower()] = (rel_prefix + file, file)
             if file.lower().endswith((".gb", ".gbc")):
-                folder_counts[root] = folder_counts.get(root, 0) + 1
+                folder = os.path.join(base_dir, rel_dir) if rel_dir else base_dir
+                folder_counts[folder] = folder_counts.get(folder, 0) + 1
 
-    if folder_counts:
-        best_gbrom_dir = max(folder_counts, key=folder_counts.get)
-        current_gbrom_dir = os.path.join(base_dir, entries["gbrom_dir"].get().strip())
-        if not os.path.exists(current_gbrom_dir):
-            entries["gbrom_dir"].delete(0, tk.END)
-            entries["gbrom_dir"].insert(0, os.path.relpath(best_gbrom_dir, base_dir).replace("\\", "/"))
+    return file_index, folder_counts
 
-    # Search for missing GB/GBA saves and populate subfolder if needed
-    for key in ["Green", "Red", "Blue", "Yellow", "Gold", "Silver", "Crystal"]:
-        current_value = entries[key].get().strip()
-        gb_subfolder = entries["gb_dir"].get().strip()
-        full_path = os.path.join(base_dir, gb_subfolder, current_value + ".srm").replace("\\", "/")
+### ==================  Prefix Matching ================== ###
 
-        if not os.path.exists(full_path):
-            potential_match = next((f for f in file_index if f.startswith(f"pokemon - {key.lower()} version") and f.endswith(".srm")), None)
-            if potential_match:
-                found_path = file_index[potential_match][0]
-                entries[key].delete(0, tk.END)
-                entries[key].insert(0, os.path.splitext(file_index[potential_match][1])[0])
+# Preferred region tags, best first; anything else ranks after these
+REGION_PREFERENCE = ["usa, europe", "usa", "world", "europe", "usa, australia", "australia"]
+UNWANTED_TAGS = ("beta", "proto", "demo", "sample", "hack")
 
-                # Update GB subfolder if invalid
-                detected_gb_dir = os.path.dirname(found_path)
-                if not os.path.exists(os.path.join(base_dir, gb_subfolder)):
-                    entries["gb_dir"].delete(0, tk.END)
-                    entries["gb_dir"].insert(0, detected_gb_dir)
+class PrefixIndex:
+    """Sorted list of the lowercase filenames in a file_index, for bisect prefix lookups."""
 
-    for key in ["Ruby", "Sapphire", "Emerald", "FireRed", "LeafGreen"]:
-        current_value = entries[key].get().strip()
-        gba_subfolder = entries["gba_dir"].get().strip()
-        full_path = os.path.join(base_dir, gba_subfolder, current_value + ".srm").replace("\\", "/")
+    def __init__(self, file_index):
+        self._keys = sorted(file_index)
 
-        if not os.path.exists(full_path):
-            potential_match = next((f for f in file_index if f.startswith(f"pokemon - {key.lower()} version") and f.endswith(".srm")), None)
-            if potential_match:
-                found_path = file_index[potential_match][0]
-                entries[key].delete(0, tk.END)
-                entries[key].insert(0, os.path.splitext(file_index[potential_match][1])[0])
+    def __len__(self):
+        return len(self._keys)
 
-                # Update GBA subfolder if invalid
-                detected_gba_dir = os.path.dirname(found_path)
-                if not os.path.exists(os.path.join(base_dir, gba_subfolder)):
-                    entries["gba_dir"].delete(0, tk.END)
-                    entries["gba_dir"].insert(0, detected_gba_dir)
+    def with_prefix(self, prefix):
+        """Yields every filename starting with prefix, in sorted order."""
+        keys = self._keys
+        for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                break
+            yield keys[i]
+
+def rank_candidate(filename, prefix):
+    """Sort key for a filename matching prefix: exact title, preferred region, clean dump, newest revision."""
+    stem = os.path.splitext(filename)[0]
+    remainder = stem[len(prefix):]
+    tags = [tag.strip() for tag in re.findall(r"\(([^)]*)\)", stem)]
+
+    # "pokemon stadium" should prefer "Pokemon Stadium (USA)" over "Pokemon Stadium 2 (USA)"
+    exact_title = 0 if not remainder or remainder.startswith((" (", " [")) else 1
+
+    region = min((REGION_PREFERENCE.index(tag) for tag in tags if tag in REGION_PREFERENCE),
+                 default=len(REGION_PREFERENCE))
+    unwanted = 1 if any(tag.startswith(UNWANTED_TAGS) for tag in tags) else 0
+
+    revision = 0
+    for tag in tags:
+        match = re.fullmatch(r"rev ([0-9a-z]+)", tag)
+        if match:
+            value = match.group(1)
+            revision = int(value) if value.isdigit() else ord(value[0]) - ord("a") + 1
+
+    return (exact_title, region, unwanted, -revision, filename)
+
+def find_candidates(prefix_index, prefix, extensions):
+    """Returns every indexed filename starting with prefix and ending with one of extensions, best first."""
+    matches = [f for f in prefix_index.with_prefix(prefix) if f.endswith(extensions)]
+    return sorted(matches, key=lambda f: rank_candidate(f, prefix))
+
+def find_match(prefix_index, prefix, extensions):
+    """Returns the best indexed filename starting with prefix and ending with one of extensions."""
+    candidates = find_candidates(prefix_index, prefix, extensions)
+    return candidates[0] if candidates else None
+
+def plan_search_updates(base_dir, values, file_index, folder_counts):
+    """Works out which entries the search should fill in.
+
+    values maps entry keys to their current text. Returns {entry key: new text}
+    for every entry that is missing or invalid and has a match in file_index.
+    """
+    values = dict(values)
+    updates = {}
+    prefix_index = PrefixIndex(file_index)
+
+    def update(key, value):
+        values[key] = value
+        updates[key] = value
+
+    if folder_counts:
+        best_gbrom_dir = max(folder_counts, key=folder_counts.get)
+        current_gbrom_dir = os.path.join(base_dir, values["gbrom_dir"])
+        if not os.path.exists(current_gbrom_dir):
+            update("gbrom_dir", os.path.relpath(best_gbrom_dir, base_dir).replace("\\", "/"))
+
+    # Search for missing GB/GBA saves and populate subfolder if needed
+    for keys, subfolder_key in [(["Green", "Red", "Blue", "Yellow", "Gold", "Silver", "Crystal"], "gb_dir"),
+                                (["Ruby", "Sapphire", "Emerald", "FireRed", "LeafGreen"], "gba_dir")]:
+        for key in keys:
+            subfolder = values[subfolder_key]
+            full_path = os.path.join(base_dir, subfolder, values[key] + ".srm").replace("\\", "/")
+
+            if not os.path.exists(full_path):
+                potential_match = find_match(prefix_index, f"pokemon - {key.lower()} version", ".srm")
+                if potential_match:
+                    found_path = file_index[potential_match][0]
+                    update(key, os.path.splitext(file_index[potential_match][1])[0])
+
+                    # Update GB/GBA subfolder if invalid
+                    if not os.path.exists(os.path.join(base_dir, subfolder)):
+                        update(subfolder_key, os.path.dirname(found_path))
 
     # Find N64 ROMs and set TransferPak subfolder if needed
     for stadium, stadium_prefix in [("Stadium 1", "pokemon stadium"), ("Stadium 2", "pokemon stadium 2")]:
-        current_value = entries[stadium].get().strip()
-        sav_subfolder = entries["sav_dir"].get().strip()
-        full_path = os.path.join(base_dir, sav_subfolder, current_value).replace("\\", "/")
+        sav_subfolder = values["sav_dir"]
+        full_path = os.path.join(base_dir, sav_subfolder, values[stadium]).replace("\\", "/")
 
         if not os.path.exists(full_path):
-            potential_match = next((f for f in file_index if f.startswith(stadium_prefix) and f.endswith((".n64", ".z64"))), None)
+            potential_match = find_match(prefix_index, stadium_prefix, (".n64", ".z64"))
             if potential_match:
                 found_path = file_index[potential_match][0]
-                entries[stadium].delete(0, tk.END)
-                entries[stadium].insert(0, file_index[potential_match][1])
+                update(stadium, file_index[potential_match][1])
 
                 # Update sav subfolder if invalid
-                detected_sav_dir = os.path.dirname(found_path)
                 if not os.path.exists(os.path.join(base_dir, sav_subfolder)):
-                    entries["sav_dir"].delete(0, tk.END)
-                    entries["sav_dir"].insert(0, detected_sav_dir)
+                    update("sav_dir", os.path.dirname(found_path))
+
+    return updates
+
+### ===  Background search === ###
+
+# State of the running search (only touched on the Tk thread)
+search_queue = None
+search_cancel_event = None
+search_progress = [0, 0]  # folders scanned, matches found
+
+def search_worker(base_dir, values, prune_dirs, max_depth, results, cancel_event):
+    """Runs the search off the Tk thread and reports progress and the outcome through results."""
+    try:
+        file_index, folder_counts = index_files(base_dir, prune_dirs=prune_dirs, max_depth=max_depth,
+                                                progress=lambda folders, matches: results.put(("progress", folders, matches)),
+                                                cancel_event=cancel_event)
+        if cancel_event.is_set():
+            raise SearchCancelled()
+        results.put(("done", plan_search_updates(base_dir, values, file_index, folder_counts)))
+    except SearchCancelled:
+        results.put(("cancelled",))
+    except Exception as e:
+        results.put(("error", str(e)))
 
-    update_status_icons()
+def search_for_files():
+    """Starts a background search, or cancels the one that is running."""
+    global search_queue, search_cancel_event
+
+    if search_cancel_event is not None:
+        search_cancel_event.set()
+        return
+
+    base_dir = entries["base_dir"].get().strip()
+    if not os.path.exists(base_dir):
+        return print("❌ Search Aborted: Base directory does not exist.")
+
+    # Snapshot the entries here, Tk widgets must not be read from the worker
+    values = {key: entry.get().strip() for key, entry in entries.items() if isinstance(entry, tk.Entry)}
+    prune_dirs, max_depth = get_search_settings()
+
+    search_queue = queue.Queue()
+    search_cancel_event = threading.Event()
+    search_progress[:] = [0, 0]
+    threading.Thread(target=search_worker, daemon=True,
+                     args=(base_dir, values, prune_dirs, max_depth, search_queue, search_cancel_event)).start()
+
+    search_button.config(text="✕")  # Clicking again cancels
+    root.after(100, poll_search_queue)
+
+def poll_search_queue():
+    """Drains progress messages from the search worker and applies the result when it finishes."""
+    global search_queue, search_cancel_event
+
+    while True:
+        try:
+            message = search_queue.get_nowait()
+        except queue.Empty:
+            break
+
+        kind = message[0]
+        if kind == "progress":
+            search_progress[0] += message[1]
+            search_progress[1] += message[2]
+            continue
+
+        # The search finished, was cancelled or failed
+        search_queue = search_cancel_event = None
+        search_button.config(text="⭯")
+        root.title(WINDOW_TITLE)
+
+        if kind == "done":
+            # Apply every update in one go so the entries never show a half-finished search
+            for key, value in message[1].items():
+                entries[key].delete(0, tk.END)
+                entries[key].insert(0, value)
+            print(f"✔️ Search finished: {search_progress[0]} folders scanned, {search_progress[1]} matches found.")
+            schedule_status_update(force=True)
+        elif kind == "cancelled":
+            print("❌ Search cancelled.")
+        else:
+            print(f"❌ Search failed: {message[1]}")
+        return
+
+    root.title(f"{WINDOW_TITLE} - Searching... {search_progress[0]} folders, {search_progress[1]} matches")
+    root.after(100, poll_search_queue)
 
 ### ==================  Check if path exist ================== ###
+class PathExistenceCache:
+    """Answers existence checks from one os.scandir per folder, cached for a short time."""
+
+    def __init__(self, ttl=STATUS_CACHE_TTL):
+        self.ttl = ttl
+        self._listings = {}  # folder -> (time listed, set of normcased names or None if missing)
+
+    def _listing(self, folder):
+        now = time.monotonic()
+        cached = self._listings.get(folder)
+        if cached and now - cached[0] < self.ttl:
+            return cached[1]
+        try:
+            with os.scandir(folder) as it:
+                names = {os.path.normcase(entry.name) for entry in it}
+        except OSError:
+            names = None
+        self._listings[folder] = (now, names)
+        return names
+
+    def exists(self, path):
+        path = os.path.normpath(path)
+        folder, name = os.path.split(path)
+        if not name:  # Drive or filesystem root
+            return os.path.exists(path)
+        names = self._listing(folder or os.curdir)
+        return names is not None and os.path.normcase(name) in names
+
+    def clear(self):
+        self._listings.clear()
+
+path_cache = PathExistenceCache()
+
 def check_path_existence(path):
     """Returns whether a path exists."""
-    return os.path.exists(os.path.normpath(path))
+    return path_cache.exists(path)
 
 ### ==================  Update status icons ================== ###
 def update_entry_status(key, path, exists):
@@ -211,41 +537,79 @@ def update_entry_status(key, path, exists):
     else:
         status_labels[key].config(text="⚠️" if not exists else "✔️", fg="red" if not exists else "green")
 
-def update_status_icons():
-    """Updates status icons based on path existence and dropdown selections."""
+def resolve_entry_path(key, base_dir):
+    """Returns the full path a textbox points to, or None if it is empty."""
+    path = entries[key].get().strip()
+    if not path:
+        return None
+
+    path = os.path.normpath(path)
+    if key in ["gb_dir", "gba_dir", "sav_dir", "gbrom_dir"]:  # Subfolders
+        path = os.path.join(base_dir, path)
+    elif key in ["Stadium 1", "Stadium 2"]:  # N64 ROMs
+        path = os.path.join(base_dir, entries["sav_dir"].get().strip(), path)
+    elif key in ["Green", "Red", "Blue", "Yellow", "Gold", "Silver", "Crystal"]:  # GB Saves
+        path = os.path.join(base_dir, entries["gb_dir"].get().strip(), path + ".srm")
+    elif key in ["Ruby", "Sapphire", "Emerald", "FireRed", "LeafGreen"]:  # GBA Saves
+        path = os.path.join(base_dir, entries["gba_dir"].get().strip(), path + ".srm")
+    return path
+
+checked_inputs = {}        # key -> input the status icon was last computed from
+status_update_job = None   # Pending root.after id for a debounced update
+status_update_force = False  # Whether the pending update should bypass the caches
+
+def schedule_status_update(force=False):
+    """Debounces status updates so a burst of edits results in a single check."""
+    global status_update_job, status_update_force
+    status_update_force = status_update_force or force
+    if status_update_job is not None:
+        root.after_cancel(status_update_job)
+    status_update_job = root.after(STATUS_DEBOUNCE_MS, lambda: update_status_icons(status_update_force))
+
+def update_status_icons(force=False):
+    """Updates status icons based on path existence and dropdown selections.
+
+    Only entries whose resolved path changed are re-checked, unless force is set.
+    """
+    global status_update_job, status_update_force
+    if status_update_job is not None:
+        root.after_cancel(status_update_job)
+        status_update_job = None
+    status_update_force = False
+    if force:
+        path_cache.clear()
+        checked_inputs.clear()
+
     base_dir = entries["base_dir"].get().strip()
 
     for key, entry in entries.items():
+        if key in ["RetroarchTransferPak1", "RetroarchTransferPak2"]:
+            continue  # Mirrors a save slot, handled below
         try:
             if isinstance(entry, tk.Entry):  # Handle text fields
-                path = entry.get().strip()
-
-                if not path:  # Skip empty paths
-                    update_entry_status(key, None, False)
+                path = resolve_entry_path(key, base_dir)
+                if checked_inputs.get(key, "") == path:
                     continue
+                update_entry_status(key, path, path is not None and path_cache.exists(path))
 
-                path = os.path.normpath(path)
-
-                if key in ["gb_dir", "gba_dir", "sav_dir", "gbrom_dir"]:  # Subfolders
-                    path = os.path.join(base_dir, path)
-                elif key in ["Stadium 1", "Stadium 2"]:  # N64 ROMs
-                    path = os.path.join(base_dir, entries["sav_dir"].get().strip(), path)
-                elif key in ["Green", "Red", "Blue", "Yellow", "Gold", "Silver", "Crystal"]:  # GB Saves
-                    path = os.path.join(base_dir, entries["gb_dir"].get().strip(), path + ".srm")
-                elif key in ["Ruby", "Sapphire", "Emerald", "FireRed", "LeafGreen"]:  # GBA Saves
-                    path = os.path.join(base_dir, entries["gba_dir"].get().strip(), path + ".srm")
+            elif isinstance(entry, tk.StringVar):  # Handle dropdowns
+                value = entry.get().strip()
+                if checked_inputs.get(key, "") == value:
+                    continue
+                update_entry_status(key, None, bool(value))
+                path = value
 
-                exists = os.path.exists(path)
-                update_entry_status(key, path, exists)
+            else:
+                continue  # Checkboxes (BooleanVar) have no path to check
 
-            elif isinstance(entry, tk.StringVar):  # Handle dropdowns
-                update_entry_status(key, None, bool(entry.get().strip()))
+            checked_inputs[key] = path
 
         except Exception as e:
             print(f"⚠️ Error updating status for {key}: {e}")
+            checked_inputs.pop(key, None)
             status_labels[key].config(text="⚠️", fg="red")  # Set to error state
 
-    # ✅ Run a second time to update TransferPak dropdowns AFTER save slots are updated
+    # ✅ Update TransferPak dropdowns AFTER save slots are updated
     for key in ["RetroarchTransferPak1", "RetroarchTransferPak2"]:
         selected_game = entries[key].get().strip()
         if selected_game and selected_game in status_labels:
@@ -262,8 +626,7 @@ def update_status_icons():
 ### ==================  Monitor changes in textboxes ================== ###
 def on_entry_updated(*args):
     """Triggered when any textbox or dropdown is updated"""
-    print("Textbox or Dropdown updated!")  # Debugging
-    update_status_icons()
+    schedule_status_update()
 
 def handle_paste(event):
     """Handle paste events in textboxes"""
@@ -410,7 +773,7 @@ def auto_populate_subfolder():
         update_textbox_if_invalid("sav_dir", subfolder_path)
 
     # Ensure UI reflects the updates
-    update_status_icons()
+    schedule_status_update()
 
 
 
@@ -420,9 +783,13 @@ def save_configuration():
     config = configparser.ConfigParser()
     config.optionxform = str
 
+    # Keep settings the UI doesn't manage (e.g. quiet_period)
+    config.read(CONFIG_FILE)
+
     # Ensure all sections exist
     for section in DEFAULT_CONFIG:
-        config[section] = {}
+        if section not in config:
+            config[section] = {}
 
     # Retrieve values from UI elements
     for key, entry in entries.items():
@@ -471,6 +838,21 @@ def save_configuration():
         config.write(configfile)
 
     print("✔️ Configuration saved successfully!")
+    threading.Thread(target=notify_running_sync, daemon=True).start()
+
+def notify_running_sync():
+    """Tells a running PokemonStadiumSync.py to reload the config file."""
+    try:
+        # Same port, token and instance id the sync script uses for this user and config file
+        from PokemonStadiumSync import send_command
+        reply = send_command("reload-config", CONFIG_FILE, timeout=30)
+    except (ImportError, OSError):
+        return  # Not running (or not next to this file), it reads the new config when started
+
+    if reply.get("ok"):
+        print("✔️ The running sync script reloaded the configuration.")
+    else:
+        print(f"⚠️ The running sync script could not reload the configuration: {reply.get('error')}")
 
 ### ==================  Load configuration ================== ###
 def load_or_create_config():
@@ -581,35 +963,7 @@ def write_default_config(config):
 
 
 
-### ==================  Create UI ================== ###
-root = tk.Tk()
-root.title("Pokemon Stadium Sync Configuration")
-root.columnconfigure(2, weight=1)  # Make column 2 expand when resizing
-
-def apply_dark_mode():
-    """Apply custom dark mode styling to the UI"""
-    DARK_BG = "#212121"
-    LIGHT_TEXT = "#CCCCCC"
-    ACCENT_COLOR = "#424242"
-
-    root.configure(bg=DARK_BG)
-
-    for widget in root.winfo_children():
-        if isinstance(widget, tk.Label):
-            widget.configure(bg=DARK_BG, fg=LIGHT_TEXT)
-        elif isinstance(widget, tk.Entry):
-            widget.configure(bg=ACCENT_COLOR, fg=LIGHT_TEXT, insertbackground=LIGHT_TEXT)
-        elif isinstance(widget, tk.Button):
-            widget.configure(bg=ACCENT_COLOR, fg=LIGHT_TEXT)
-        elif isinstance(widget, tk.Checkbutton):
-            widget.configure(bg=DARK_BG, fg=LIGHT_TEXT, selectcolor=ACCENT_COLOR)
-        elif isinstance(widget, tk.OptionMenu):
-            widget.configure(bg=ACCENT_COLOR, fg=LIGHT_TEXT)
-apply_dark_mode()
-
-# Add an empty frame at the top for padding
-padding_frame = tk.Frame(root, height=8, bg="#212121")  # Reduced height for better spacing
-padding_frame.grid(row=0, column=0, columnspan=3, sticky="nsew")  # "nsew" ensures proper alignment
+### ==================  UI Layout ================== ###
 
 # Dictionary for label text
 labels = {
@@ -661,215 +1015,261 @@ label_colors = {
 # Dictionary to store entry fields
 entries = {}
 
+WINDOW_TITLE = "Pokemon Stadium Sync Configuration"
 
-### ==================  Build UI ================== ###
-for idx, (key, text) in enumerate(labels.items(), start=1):
-    # Create label for the setting name
-    frame = tk.Frame(root, bg="#212121")
-    frame.grid(row=idx, column=0, padx=10, pady=5, sticky="w")
+# Set in main() when the window is built
+root = None
+search_button = None
+stay_open_var = None
+run_minimized_var = None
 
-    tk.Label(frame, text=text, fg="#CCCCCC", bg="#212121").grid(row=0, column=0, sticky="w")
 
-    # ✔️ ADD STATUS LABEL IN COLUMN 1
-    status_label = tk.Label(root, text="⚠️", fg="red", bg="#212121", font=("Segoe UI", 12))
-    status_label.grid(row=idx, column=1, padx=8, pady=5)
-    status_labels[key] = status_label  # Store reference to update later
+### ==================  Create UI ================== ###
+def main():
+    """Builds the configuration window and runs the Tk main loop."""
+    global root, stay_open_var, run_minimized_var, search_button
+
+    root = tk.Tk()
+    root.title(WINDOW_TITLE)
+    root.columnconfigure(2, weight=1)  # Make column 2 expand when resizing
+
+    def apply_dark_mode():
+        """Apply custom dark mode styling to the UI"""
+        DARK_BG = "#212121"
+        LIGHT_TEXT = "#CCCCCC"
+        ACCENT_COLOR = "#424242"
+
+        root.configure(bg=DARK_BG)
+
+        for widget in root.winfo_children():
+            if isinstance(widget, tk.Label):
+                widget.configure(bg=DARK_BG, fg=LIGHT_TEXT)
+            elif isinstance(widget, tk.Entry):
+                widget.configure(bg=ACCENT_COLOR, fg=LIGHT_TEXT, insertbackground=LIGHT_TEXT)
+            elif isinstance(widget, tk.Button):
+                widget.configure(bg=ACCENT_COLOR, fg=LIGHT_TEXT)
+            elif isinstance(widget, tk.Checkbutton):
+                widget.configure(bg=DARK_BG, fg=LIGHT_TEXT, selectcolor=ACCENT_COLOR)
+            elif isinstance(widget, tk.OptionMenu):
+                widget.configure(bg=ACCENT_COLOR, fg=LIGHT_TEXT)
+    apply_dark_mode()
+
+    # Add an empty frame at the top for padding
+    padding_frame = tk.Frame(root, height=8, bg="#212121")  # Reduced height for better spacing
+    padding_frame.grid(row=0, column=0, columnspan=3, sticky="nsew")  # "nsew" ensures proper alignment
+
+    ### ==================  Build UI ================== ###
+    for idx, (key, text) in enumerate(labels.items(), start=1):
+        # Create label for the setting name
+        frame = tk.Frame(root, bg="#212121")
+        frame.grid(row=idx, column=0, padx=10, pady=5, sticky="w")
 
-    # Handle textboxes
-    if key in dropdown_options:
-        var = tk.StringVar()
-        var.set("")
-        dropdown = tk.OptionMenu(root, var, *dropdown_options[key])
-        dropdown.config(width=14, bg="#424242", fg="white", activebackground="#565656", activeforeground="white", relief="flat")
-        dropdown.grid(row=idx, column=2, padx=3, pady=4, ipady=1, sticky="w")
-        entries[key] = var
-    else:
-        entry = tk.Entry(root, width=60, font=("Segoe UI", 10), bg="#424242", fg="white", insertbackground="white", relief="flat")
-        entry.grid(row=idx, column=2, padx=3, pady=4, ipady=1, sticky="w")
-        entries[key] = entry
-
-        # Add browse button
-        browse_button = tk.Button(root, text="Browse", command=lambda k=key: browse_path(k),
-                                  font=("Segoe UI", 10), width=9, bd=0, relief="flat", bg="#424242", fg="white",
-                                  activebackground="#555", activeforeground="white")
-        browse_button.grid(row=idx, column=3, padx=5, pady=5)
-
-        # ✔️ Bind event to update status when textbox is modified
-        entry.bind("<FocusOut>", lambda e, k=key: update_status_icons())
-        var = tk.StringVar()
-        var.trace_add("write", lambda *args, k=key: update_status_icons())
-        entry.config(textvariable=var)
-    frame = tk.Frame(root, bg="#212121")
-    frame.grid(row=idx, column=0, padx=10, pady=5, sticky="w")
-
-    if key in label_colors:
-        # Separate "Version" for GB and GBA labels
-        game_name, _, version_text = text.partition(" Version")
-        game_label = tk.Label(frame, text=game_name, fg=label_colors[key], bg="#212121")
-        game_label.grid(row=0, column=0, sticky="w")
-
-        if version_text:
-            version_label = tk.Label(frame, text=" Version:", fg="#CCCCCC", bg="#212121")
-            version_label.grid(row=0, column=1, sticky="w")
-    else:
         tk.Label(frame, text=text, fg="#CCCCCC", bg="#212121").grid(row=0, column=0, sticky="w")
 
-    # ✔️ INSERT EMPTY COLUMN (SPACER)
-    root.grid_columnconfigure(1, minsize=5)  # Adjust width for spacing
-
-    # Create dropdown menus
-    if key in dropdown_options:
-        var = tk.StringVar()
-        var.set("")
-
-        frame = tk.Frame(root, bg="#212121")  # Create a frame for label + dropdown
-        frame.grid(row=idx, column=2, padx=0, pady=5, sticky="w")  
-
-        # Create the label next to the dropdown
-        label = tk.Label(frame, text="Select game to use with Pokemon Stadium" if key == "RetroarchTransferPak1"
-                                  else "Select game to use with Pokemon Stadium 2",
-                         fg="#878787", bg="#212121", font=("Segoe UI", 9))
-        label.pack(side="right", padx=8)  # Align to the right of dropdown
-
-        # Create dropdown inside the frame
-        dropdown = tk.OptionMenu(frame, var, *dropdown_options[key])
-        dropdown.config(
-            width=16,  
-            bg="#424242",  
-            fg="white",  
-            activebackground="#565656",  
-            activeforeground="white",  
-            relief="flat", 
-            highlightthickness=3,
-            highlightbackground="#212121",  
-            highlightcolor="#777"
-        )
-
-        # ✔️ Modify the actual dropdown menu (the list of options)
-        dropdown["menu"].config(
-            bg="#424242",  
-            fg="white",  
-            activebackground="#555",  
-            activeforeground="white",
-            font=("Segoe UI", 10),
-            relief="flat",  
-        )
-
-        dropdown.pack(side="left")  
-
-        entries[key] = var  
+        # ✔️ ADD STATUS LABEL IN COLUMN 1
+        status_label = tk.Label(root, text="⚠️", fg="red", bg="#212121", font=("Segoe UI", 12))
+        status_label.grid(row=idx, column=1, padx=8, pady=5)
+        status_labels[key] = status_label  # Store reference to update later
+
+        # Handle textboxes
+        if key in dropdown_options:
+            var = tk.StringVar()
+            var.set("")
+            dropdown = tk.OptionMenu(root, var, *dropdown_options[key])
+            dropdown.config(width=14, bg="#424242", fg="white", activebackground="#565656", activeforeground="white", relief="flat")
+            dropdown.grid(row=idx, column=2, padx=3, pady=4, ipady=1, sticky="w")
+            entries[key] = var
+        else:
+            entry = tk.Entry(root, width=60, font=("Segoe UI", 10), bg="#424242", fg="white", insertbackground="white", relief="flat")
+            entry.grid(row=idx, column=2, padx=3, pady=4, ipady=1, sticky="w")
+            entries[key] = entry
+
+            # Add browse button
+            browse_button = tk.Button(root, text="Browse", command=lambda k=key: browse_path(k),
+                                      font=("Segoe UI", 10), width=9, bd=0, relief="flat", bg="#424242", fg="white",
+                                      activebackground="#555", activeforeground="white")
+            browse_button.grid(row=idx, column=3, padx=5, pady=5)
+
+            # ✔️ Bind event to update status when textbox is modified
+            entry.bind("<FocusOut>", lambda e, k=key: schedule_status_update(force=True))
+            var = tk.StringVar()
+            var.trace_add("write", lambda *args, k=key: schedule_status_update())
+            entry.config(textvariable=var)
+        frame = tk.Frame(root, bg="#212121")
+        frame.grid(row=idx, column=0, padx=10, pady=5, sticky="w")
+
+        if key in label_colors:
+            # Separate "Version" for GB and GBA labels
+            game_name, _, version_text = text.partition(" Version")
+            game_label = tk.Label(frame, text=game_name, fg=label_colors[key], bg="#212121")
+            game_label.grid(row=0, column=0, sticky="w")
+
+            if version_text:
+                version_label = tk.Label(frame, text=" Version:", fg="#CCCCCC", bg="#212121")
+                version_label.grid(row=0, column=1, sticky="w")
+        else:
+            tk.Label(frame, text=text, fg="#CCCCCC", bg="#212121").grid(row=0, column=0, sticky="w")
+
+        # ✔️ INSERT EMPTY COLUMN (SPACER)
+        root.grid_columnconfigure(1, minsize=5)  # Adjust width for spacing
+
+        # Create dropdown menus
+        if key in dropdown_options:
+            var = tk.StringVar()
+            var.set("")
+
+            frame = tk.Frame(root, bg="#212121")  # Create a frame for label + dropdown
+            frame.grid(row=idx, column=2, padx=0, pady=5, sticky="w")  
+
+            # Create the label next to the dropdown
+            label = tk.Label(frame, text="Select game to use with Pokemon Stadium" if key == "RetroarchTransferPak1"
+                                      else "Select game to use with Pokemon Stadium 2",
+                             fg="#878787", bg="#212121", font=("Segoe UI", 9))
+            label.pack(side="right", padx=8)  # Align to the right of dropdown
+
+            # Create dropdown inside the frame
+            dropdown = tk.OptionMenu(frame, var, *dropdown_options[key])
+            dropdown.config(
+                width=16,  
+                bg="#424242",  
+                fg="white",  
+                activebackground="#565656",  
+                activeforeground="white",  
+                relief="flat", 
+                highlightthickness=3,
+                highlightbackground="#212121",  
+                highlightcolor="#777"
+            )
+
+            # ✔️ Modify the actual dropdown menu (the list of options)
+            dropdown["menu"].config(
+                bg="#424242",  
+                fg="white",  
+                activebackground="#555",  
+                activeforeground="white",
+                font=("Segoe UI", 10),
+                relief="flat",  
+            )
+
+            dropdown.pack(side="left")  
+
+            entries[key] = var  
 
-    else:
-        entry = tk.Entry(root, width=60, font=("Segoe UI", 10),
-                         bg="#424242", fg="white", insertbackground="white",
-                         relief="flat", highlightthickness=1, 
-                         highlightbackground="#555", highlightcolor="#777")
-        entry.grid(row=idx, column=2, padx=3, pady=4, ipady=1, sticky="ew")  # ✔️ Column moved to 2
-        entries[key] = entry
-
-        # Create browse buttons
-        browse_button = tk.Button(
-            root,
-            text="Browse",
-            command=lambda k=key: browse_path(k),
-            font=("Segoe UI", 10),  
-            width=9,  
-            bd=0,  
-            relief="flat",  
-            bg="#424242",  
-            fg="white",
-            activebackground="#555",  
-            activeforeground="white"
-        )
-
-        browse_button.bind("<Enter>", lambda e: e.widget.configure(bg="#666"))
-        browse_button.bind("<Leave>", lambda e: e.widget.configure(bg="#424242"))
-
-        browse_button.grid(row=idx, column=3, padx=5, pady=5)  # ✔️ Browse button in column 3
-
-### ===  Search Button === ###
-search_button = tk.Button(
-    root,
-    text="⭯",
-    font=("Segoe UI", 10),  # Match browse buttons
-    width=9,  # Match browse button width
-    bd=0,  # No border
-    relief="flat",
-    bg="#424242",  # Same as textboxes
-    fg="white",
-    activebackground="#555",  # Slightly lighter on hover
-    activeforeground="white"
-)
-search_button.bind("<Enter>", lambda e: e.widget.configure(bg="#666"))
-search_button.bind("<Leave>", lambda e: e.widget.configure(bg="#424242"))
-search_button.grid(row=1 + 1, column=3, columnspan=1, padx=5, pady=5, sticky="s")
-
-# Checkbox for "Run minimized"
-run_minimized_var = tk.BooleanVar()
-entries["run_minimized"] = run_minimized_var
-run_minimized_checkbox = tk.Checkbutton(
-    root,
-    text="Start minimized",
-    variable=run_minimized_var,
-    bg="#212121", fg="white",
-    selectcolor="#212121",  
-    font=("Segoe UI", 10),
-    activebackground="#212121",
-    activeforeground="white",
-    relief="flat",
-    border=20,
-    highlightbackground="#212121",
-)
-run_minimized_checkbox.grid(row=len(labels) + 1, column=0, columnspan=3, padx=8, pady=0, sticky="w")
-
-# Checkbox for "Stay Open"
-stay_open_var = tk.BooleanVar()
-entries["stay_open"] = stay_open_var  
-stay_open_checkbox = tk.Checkbutton(
-    root,
-    text="Close after synchronization",
-    variable=stay_open_var,
-    bg="#212121", fg="white",
-    selectcolor="#212121",  
-    font=("Segoe UI", 10),
-    activebackground="#212121",
-    activeforeground="white",
-    relief="flat",
-    border=20,
-    highlightbackground="#212121",
-)
-stay_open_checkbox.grid(row=len(labels) + 1, column=2, columnspan=1, padx=0, pady=0, sticky="w")
-
-### ===  Save Button === ###
-save_button = tk.Button(
-    root,
-    text="Save Configuration",
-    font=("Segoe UI", 10),  # Match browse buttons
-    width=18,  # Match browse button width
-    bd=0,  # No border
-    relief="flat",
-    bg="#424242",  # Same as textboxes
-    fg="white",
-    activebackground="#555",  # Slightly lighter on hover
-    activeforeground="white"
-)
-save_button.bind("<Enter>", lambda e: e.widget.configure(bg="#666"))
-save_button.bind("<Leave>", lambda e: e.widget.configure(bg="#424242"))
-save_button.grid(row=len(labels) + 1, column=2, columnspan=2, padx=15, pady=15, sticky="e")
-
-# Attach change detection to all textboxes and dropdowns
-for key, entry in entries.items():
-    if isinstance(entry, tk.Entry):  # Handle textboxes
-        entry.bind("<KeyRelease>", lambda e, k=key: on_entry_updated())  # Detect manual typing
-        entry.bind("<FocusOut>", lambda e, k=key: on_entry_updated())  # Detect when textbox loses focus
-    elif isinstance(entry, tk.StringVar):  # Handle dropdown changes
-        entry.trace_add("write", lambda *args, k=key: on_entry_updated())  # Detect dropdown selection changes
-
-search_button.config(command=search_for_files)
-save_button.config(command=save_configuration)   
-config = load_or_create_config()
-update_status_icons()
-
-
-### ==================  Run UI ================== ###
-root.mainloop()
\ No newline at end of file
+        else:
+            entry = tk.Entry(root, width=60, font=("Segoe UI", 10),
+                             bg="#424242", fg="white", insertbackground="white",
+                             relief="flat", highlightthickness=1, 
+                             highlightbackground="#555", highlightcolor="#777")
+            entry.grid(row=idx, column=2, padx=3, pady=4, ipady=1, sticky="ew")  # ✔️ Column moved to 2
+            entries[key] = entry
+
+            # Create browse buttons
+            browse_button = tk.Button(
+                root,
+                text="Browse",
+                command=lambda k=key: browse_path(k),
+                font=("Segoe UI", 10),  
+                width=9,  
+                bd=0,  
+                relief="flat",  
+                bg="#424242",  
+                fg="white",
+                activebackground="#555",  
+                activeforeground="white"
+            )
+
+            browse_button.bind("<Enter>", lambda e: e.widget.configure(bg="#666"))
+            browse_button.bind("<Leave>", lambda e: e.widget.configure(bg="#424242"))
+
+            browse_button.grid(row=idx, column=3, padx=5, pady=5)  # ✔️ Browse button in column 3
+
+    ### ===  Search Button === ###
+    search_button = tk.Button(
+        root,
+        text="⭯",
+        font=("Segoe UI", 10),  # Match browse buttons
+        width=9,  # Match browse button width
+        bd=0,  # No border
+        relief="flat",
+        bg="#424242",  # Same as textboxes
+        fg="white",
+        activebackground="#555",  # Slightly lighter on hover
+        activeforeground="white"
+    )
+    search_button.bind("<Enter>", lambda e: e.widget.configure(bg="#666"))
+    search_button.bind("<Leave>", lambda e: e.widget.configure(bg="#424242"))
+    search_button.grid(row=1 + 1, column=3, columnspan=1, padx=5, pady=5, sticky="s")
+
+    # Checkbox for "Run minimized"
+    run_minimized_var = tk.BooleanVar()
+    entries["run_minimized"] = run_minimized_var
+    run_minimized_checkbox = tk.Checkbutton(
+        root,
+        text="Start minimized",
+        variable=run_minimized_var,
+        bg="#212121", fg="white",
+        selectcolor="#212121",  
+        font=("Segoe UI", 10),
+        activebackground="#212121",
+        activeforeground="white",
+        relief="flat",
+        border=20,
+        highlightbackground="#212121",
+    )
+    run_minimized_checkbox.grid(row=len(labels) + 1, column=0, columnspan=3, padx=8, pady=0, sticky="w")
+
+    # Checkbox for "Stay Open"
+    stay_open_var = tk.BooleanVar()
+    entries["stay_open"] = stay_open_var  
+    stay_open_checkbox = tk.Checkbutton(
+        root,
+        text="Close after synchronization",
+        variable=stay_open_var,
+        bg="#212121", fg="white",
+        selectcolor="#212121",  
+        font=("Segoe UI", 10),
+        activebackground="#212121",
+        activeforeground="white",
+        relief="flat",
+        border=20,
+        highlightbackground="#212121",
+    )
+    stay_open_checkbox.grid(row=len(labels) + 1, column=2, columnspan=1, padx=0, pady=0, sticky="w")
+
+    ### ===  Save Button === ###
+    save_button = tk.Button(
+        root,
+        text="Save Configuration",
+        font=("Segoe UI", 10),  # Match browse buttons
+        width=18,  # Match browse button width
+        bd=0,  # No border
+        relief="flat",
+        bg="#424242",  # Same as textboxes
+        fg="white",
+        activebackground="#555",  # Slightly lighter on hover
+        activeforeground="white"
+    )
+    save_button.bind("<Enter>", lambda e: e.widget.configure(bg="#666"))
+    save_button.bind("<Leave>", lambda e: e.widget.configure(bg="#424242"))
+    save_button.grid(row=len(labels) + 1, column=2, columnspan=2, padx=15, pady=15, sticky="e")
+
+    # Attach change detection to all textboxes and dropdowns
+    for key, entry in entries.items():
+        if isinstance(entry, tk.Entry):  # Handle textboxes
+            entry.bind("<KeyRelease>", lambda e, k=key: on_entry_updated())  # Detect manual typing
+            entry.bind("<FocusOut>", lambda e, k=key: schedule_status_update(force=True))  # Re-check disk on focus loss
+        elif isinstance(entry, tk.StringVar):  # Handle dropdown changes
+            entry.trace_add("write", lambda *args, k=key: on_entry_updated())  # Detect dropdown selection changes
+
+    search_button.config(command=search_for_files)
+    save_button.config(command=save_configuration)   
+    load_or_create_config()
+    update_status_icons()
+
+
+    ### ==================  Run UI ================== ###
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Performance benchmarks for PokemonStadiumSync, run with `python -m benchmarks`.
+
+Runs headless (no Tk window, no tray icon) against synthetic RetroArch folders
+and writes the timings as JSON so results can be compared between releases.
+"""
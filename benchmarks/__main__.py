@@ -0,0 +1,3 @@
+from benchmarks.run_benchmarks import main
+
+main()
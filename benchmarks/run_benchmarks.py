@@ -0,0 +1,254 @@
+### ==================  Benchmark Runner ================== ###
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import PokemonStadiumSync
+import PokemonStadiumSyncUI
+from benchmarks.synthetic_tree import generate_retroarch_tree
+
+def measure(func, repeat):
+    """Runs func repeat times with stdout silenced and returns timing stats in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": repeat,
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "max_ms": max(timings)
+    }
+
+### ==================  Benchmarks ================== ###
+
+def bench_startup_sync(config, repeat):
+    """Times SyncEngine.sync_all(): one cold run that creates every .sav, then warm runs."""
+    engine = PokemonStadiumSync.SyncEngine(config)
+    return {
+        "cold": measure(engine.sync_all, 1),
+        "warm": measure(engine.sync_all, repeat)
+    }
+
+def bench_event_dispatch(config, repeat, events=1000):
+    """Times SaveFileEventHandler.on_modified for a mix of slot and unrelated save paths."""
+    engine = PokemonStadiumSync.SyncEngine(config)
+    handler = PokemonStadiumSync.SaveFileEventHandler(engine)
+
+    paths = [slot.srm for slot in engine.slot_table] + [slot.sav for slot in engine.slot_table]
+    for folder in (config.gb_dir, config.gba_dir):
+        paths += [os.path.join(folder, name) for name in os.listdir(folder)]
+    batch = [SimpleNamespace(src_path=paths[i % len(paths)], is_directory=False, event_type="modified")
+             for i in range(events)]
+
+    def dispatch():
+        for event in batch:
+            handler.on_modified(event)
+
+    result = measure(dispatch, repeat)
+    result["events_per_run"] = events
+    result["per_event_us"] = result["median_ms"] * 1000 / events
+    return result
+
+def bench_event_burst(config, repeat, burst=20):
+    """Times bursts of modified events, like one RetroArch save flush, with and without EventIngest.
+
+    Every slot file gets `burst` events in a row, mixed with events on unrelated files in
+    the save folders (screenshots and other games' saves). "direct" hands each event to SaveFileEventHandler, "ingest" goes
+    through EventIngest first; "counts" are its raw versus forwarded totals for one run.
+    """
+    engine = PokemonStadiumSync.SyncEngine(config)
+    handler = PokemonStadiumSync.SaveFileEventHandler(engine)
+
+    noise = []
+    for folder in (config.gb_dir, config.gba_dir):
+        noise += [os.path.join(folder, f"screenshot-{i:03d}.png") for i in range(burst)]
+        noise += [os.path.join(folder, f"Other Game {i:03d}.srm") for i in range(burst)]
+    batch = []
+    for slot in engine.slot_table:
+        for path in (slot.srm, slot.sav):
+            batch += [SimpleNamespace(src_path=path, is_directory=False, event_type="modified") for _ in range(burst)]
+    batch += [SimpleNamespace(src_path=path, is_directory=False, event_type="modified") for path in noise]
+
+    ingest = None
+    def dispatch(target):
+        for event in batch:
+            target.dispatch(event)
+
+    def dispatch_ingest():
+        nonlocal ingest
+        ingest = PokemonStadiumSync.EventIngest(handler)  # Fresh window per run
+        dispatch(ingest)
+
+    results = {"direct": measure(lambda: dispatch(handler), repeat), "ingest": measure(dispatch_ingest, repeat)}
+    for result in results.values():
+        result["events_per_run"] = len(batch)
+        result["per_event_us"] = result["median_ms"] * 1000 / len(batch)
+    results["counts"] = ingest.counts
+    return results
+
+def bench_periodic_pass(config, repeat):
+    """Times a single periodic_sync_check pass over every slot, starting from a synced tree."""
+    engine = PokemonStadiumSync.SyncEngine(config)
+    measure(engine.sync_all, 1)
+    return measure(engine.periodic_sync_pass, repeat)
+
+def bench_search_index(config, repeat):
+    """Times the UI's search_for_files indexer plus the slot and Stadium ROM lookups.
+
+    "unpruned" scans every folder, "full" scans every folder outside the prune
+    list, "cached" refreshes the index kept in
+    memory during a UI session and "cached_from_disk" first reloads it from disk,
+    like the first search after starting the UI.
+    """
+    slots = list(PokemonStadiumSync.DEFAULT_CONFIG["GBSlots"]) + list(PokemonStadiumSync.DEFAULT_CONFIG["GBASlots"])
+    cache_file = os.path.join(os.path.dirname(config.base_dir), f"{os.path.basename(config.base_dir)}.index.json")
+
+    def search(cache, prune_dirs=PokemonStadiumSyncUI.SEARCH_PRUNE_DIRS):
+        file_index, _ = PokemonStadiumSyncUI.index_files(config.base_dir, cache_file=cache, prune_dirs=prune_dirs)
+        prefix_index = PokemonStadiumSyncUI.PrefixIndex(file_index)
+        for key in slots:
+            PokemonStadiumSyncUI.find_match(prefix_index, f"pokemon - {key.lower()} version", ".srm")
+        for prefix in ("pokemon stadium", "pokemon stadium 2"):
+            PokemonStadiumSyncUI.find_match(prefix_index, prefix, (".n64", ".z64"))
+
+    def search_from_disk():
+        PokemonStadiumSyncUI._loaded_indexes.clear()
+        search(cache_file)
+
+    unpruned = measure(lambda: search(None, prune_dirs=()), repeat)
+    full = measure(lambda: search(None), repeat)
+    search(cache_file)  # Prime the on-disk index
+    return {
+        "unpruned": unpruned,
+        "full": full,
+        "cached": measure(lambda: search(cache_file), repeat),
+        "cached_from_disk": measure(search_from_disk, repeat)
+    }
+
+FAT32_GRANULARITY_NS = 2_000_000_000
+
+class Fat32SavEngine(PokemonStadiumSync.SyncEngine):
+    """SyncEngine that sees the TransferPak folder as a FAT32 SD card, which only stores even seconds."""
+
+    def timestamp_granularity(self, folder):
+        if os.path.normcase(folder) == os.path.normcase(os.path.abspath(self.config.sav_dir)):
+            return FAT32_GRANULARITY_NS
+        return super().timestamp_granularity(folder)
+
+    def record_synced(self, srm, sav):
+        # Every .sav write goes through here; round its mtime the way FAT32 would have
+        mtime_ns = os.stat(sav).st_mtime_ns
+        mtime_ns -= mtime_ns % FAT32_GRANULARITY_NS
+        os.utime(sav, ns=(mtime_ns, mtime_ns))
+        super().record_synced(srm, sav)
+
+def count_writes(output):
+    """Counts the copies and timestamp fixes in sync_files output."""
+    return sum(1 for line in output.splitlines()
+               if "Replacing it" in line or "Creating from" in line or "timestamps aligned" in line)
+
+def bench_redundant_copies(config, repeat):
+    """Counts copies made by repeated passes over an already synced tree (expected: 0).
+
+    Each round runs sync_all, the periodic pass and the scheduler callback for
+    every slot. "fat32_restart" also starts a fresh engine every round, so only
+    the timestamp tolerance (and not the journal) prevents recopying.
+    """
+    slot_count = len(PokemonStadiumSync.SyncEngine(config).slot_table)
+    scenarios = {
+        "native": (PokemonStadiumSync.SyncEngine, False),
+        "fat32": (Fat32SavEngine, False),
+        "fat32_restart": (Fat32SavEngine, True)
+    }
+
+    results = {}
+    for name, (engine_class, restart) in scenarios.items():
+        shutil.rmtree(config.sav_dir)
+        os.makedirs(config.sav_dir)
+        engine = engine_class(config)
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine.sync_all()  # Creates every .sav
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for _ in range(repeat):
+                if restart:
+                    engine = engine_class(config)
+                engine.sync_all()
+                engine.periodic_sync_pass()
+                for slot in engine.slot_table:
+                    engine.run_slot_sync(slot)
+        results[name] = {"rounds": repeat, "slots": slot_count, "redundant_writes": count_writes(output.getvalue())}
+    return results
+
+BENCHMARKS = {
+    "startup_sync": bench_startup_sync,
+    "event_dispatch": bench_event_dispatch,
+    "event_burst": bench_event_burst,
+    "periodic_pass": bench_periodic_pass,
+    "search_index": bench_search_index,
+    "redundant_copies": bench_redundant_copies
+}
+
+### ==================  Main ================== ###
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks PokemonStadiumSync against a synthetic RetroArch folder.")
+    parser.add_argument("--saves", type=int, default=500, help="unrelated .srm files in the save folders")
+    parser.add_argument("--depth", type=int, default=4, help="nesting depth of thumbnail/shader/asset folders")
+    parser.add_argument("--roms", type=int, default=200, help="unrelated GB ROMs")
+    parser.add_argument("--save-size", type=int, default=32 * 1024, help="GB save size in bytes")
+    parser.add_argument("--noise-files", type=int, default=50, help="files per level in the noise folders")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per benchmark")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), action="append", help="run only this benchmark")
+    parser.add_argument("--output", default="-", help="JSON output file ('-' for stdout)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = args.only or list(BENCHMARKS)
+
+    results = {}
+    base_dir = tempfile.mkdtemp(prefix="pss-bench-")
+    try:
+        for name in names:
+            # Fresh tree per benchmark so one can't warm caches for another
+            tree = os.path.join(base_dir, name)
+            config = generate_retroarch_tree(tree, saves=args.saves, depth=args.depth, roms=args.roms,
+                                             save_size=args.save_size, noise_files=args.noise_files)
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = BENCHMARKS[name](config, args.repeat)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "only")},
+        "results": results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
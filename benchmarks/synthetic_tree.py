@@ -0,0 +1,99 @@
+### ==================  Synthetic RetroArch Tree ================== ###
+
+import os
+import random
+
+import PokemonStadiumSync
+from PokemonStadiumSync import DEFAULT_CONFIG, SyncConfig
+
+# Folders found in a real RetroArch install that never hold saves or ROMs
+NOISE_FOLDERS = ["thumbnails", "shaders", "assets", "cores", "overlays"]
+
+def _write_file(path, size, rng):
+    with open(path, "wb") as f:
+        f.write(rng.randbytes(size))
+
+def make_valid_save(game, size, rng):
+    """Returns random save data for game with every in-save checksum set, so it passes validation."""
+    data = bytearray(rng.randbytes(size))
+    game = game.lower()
+
+    if game in ("green", "red", "blue", "yellow"):
+        start, checksum_offset = PokemonStadiumSync.GEN1_CHECKSUMS[0]
+        data[checksum_offset] = ~sum(data[start:checksum_offset]) & 0xFF
+
+    elif game in PokemonStadiumSync.GEN2_CHECKSUMS:
+        for ranges, checksum_offset in PokemonStadiumSync.GEN2_CHECKSUMS[game]:
+            total = sum(sum(data[start:end + 1]) for start, end in ranges)
+            data[checksum_offset:checksum_offset + 2] = (total & 0xFFFF).to_bytes(2, "little")
+
+    else:  # Gen 3
+        for save_index, block in enumerate(PokemonStadiumSync.GEN3_BLOCKS):
+            for section_id in range(PokemonStadiumSync.GEN3_SECTION_COUNT):
+                section = block + section_id * PokemonStadiumSync.GEN3_SECTION_SIZE
+                total = sum(int.from_bytes(data[i:i + 4], "little")
+                            for i in range(section, section + PokemonStadiumSync.GEN3_DATA_SIZES[section_id], 4))
+                data[section + 0xFF4:section + 0xFF6] = section_id.to_bytes(2, "little")
+                data[section + 0xFF6:section + 0xFF8] = (((total >> 16) + total) & 0xFFFF).to_bytes(2, "little")
+                data[section + 0xFF8:section + 0xFFC] = PokemonStadiumSync.GEN3_SIGNATURE.to_bytes(4, "little")
+                data[section + 0xFFC:section + 0x1000] = save_index.to_bytes(4, "little")
+    return bytes(data)
+
+def generate_retroarch_tree(base_dir, saves=100, depth=3, roms=50, save_size=32 * 1024,
+                            noise_files=20, seed=0):
+    """Creates a RetroArch-like folder layout under base_dir and returns a matching SyncConfig.
+
+    saves:       unrelated .srm files added next to the Pokemon saves
+    depth:       how deep the thumbnail/shader/asset folders are nested
+    roms:        number of GB ROMs in the ROM folder (besides the Pokemon ones)
+    save_size:   size in bytes of every GB save, at least 32 KB (GBA saves are 4x larger, at least 112 KB)
+    noise_files: files written at each level of the noise folders
+    """
+    rng = random.Random(seed)
+    directories = DEFAULT_CONFIG["Directories"]
+    gb_slots, gba_slots = DEFAULT_CONFIG["GBSlots"], DEFAULT_CONFIG["GBASlots"]
+
+    gb_dir = os.path.join(base_dir, directories["gb_dir"])
+    gba_dir = os.path.join(base_dir, directories["gba_dir"])
+    sav_dir = os.path.join(base_dir, directories["sav_dir"])
+    gbrom_dir = os.path.join(base_dir, directories["gbrom_dir"])
+    for path in (gb_dir, gba_dir, sav_dir, gbrom_dir):
+        os.makedirs(path, exist_ok=True)
+
+    # Pokemon saves (with valid checksums) and ROMs
+    for game, name in gb_slots.items():
+        with open(os.path.join(gb_dir, f"{name}.srm"), "wb") as f:
+            f.write(make_valid_save(game, max(save_size, 0x8000), rng))
+        _write_file(os.path.join(gbrom_dir, f"{name}.gb"), 1024, rng)
+    for game, name in gba_slots.items():
+        with open(os.path.join(gba_dir, f"{name}.srm"), "wb") as f:
+            f.write(make_valid_save(game, max(save_size * 4, 0x1C000), rng))
+    for rom in DEFAULT_CONFIG["StadiumROMs"].values():
+        _write_file(os.path.join(sav_dir, rom), 1024, rng)
+
+    # Unrelated saves and ROMs
+    for i in range(saves):
+        folder = gb_dir if i % 2 else gba_dir
+        _write_file(os.path.join(folder, f"Other Game {i:05d}.srm"), save_size, rng)
+    for i in range(roms):
+        _write_file(os.path.join(gbrom_dir, f"Other Game {i:05d}.gb"), 1024, rng)
+
+    # Deep folders full of files that are neither saves nor ROMs
+    for noise in NOISE_FOLDERS:
+        folder = os.path.join(base_dir, noise)
+        for level in range(depth):
+            folder = os.path.join(folder, f"level{level}")
+            os.makedirs(folder, exist_ok=True)
+            for i in range(noise_files):
+                _write_file(os.path.join(folder, f"{noise}_{level}_{i:04d}.png"), 64, rng)
+
+    return SyncConfig(
+        base_dir=base_dir,
+        gb_dir=directories["gb_dir"],
+        gba_dir=directories["gba_dir"],
+        sav_dir=directories["sav_dir"],
+        gbrom_dir=directories["gbrom_dir"],
+        gb_slots=gb_slots,
+        gba_slots=gba_slots,
+        n64_roms=DEFAULT_CONFIG["StadiumROMs"]
+    )
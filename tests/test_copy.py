@@ -0,0 +1,67 @@
+"""Tests for the atomic save copy and its in-kernel fast paths."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PokemonStadiumSync as pss  # noqa: E402
+
+SAVE_DATA = bytes(range(256)) * 128
+
+
+class AtomicCopyTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "Pokemon Stadium.srm")
+        self.dst = os.path.join(self.tmp.name, "Pokemon Stadium.sav")
+        with open(self.src, "wb") as f:
+            f.write(SAVE_DATA)
+        with open(self.dst, "wb") as f:
+            f.write(b"old save")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_dst(self):
+        with open(self.dst, "rb") as f:
+            return f.read()
+
+    def test_copies_contents(self):
+        pss.atomic_copy(self.src, self.dst)
+        self.assertEqual(self.read_dst(), SAVE_DATA)
+
+    def test_kernel_copy_returning_zero_falls_back(self):
+        # FUSE/SMB/procfs may report 0 bytes on the first call without copying anything
+        with mock.patch.object(os, "copy_file_range", create=True, return_value=0), \
+                mock.patch.object(os, "sendfile", create=True, return_value=0):
+            pss.atomic_copy(self.src, self.dst)
+        self.assertEqual(self.read_dst(), SAVE_DATA)
+
+    def test_short_kernel_copy_falls_back(self):
+        def copy_once(src_fd, dst_fd, count):
+            copy_once.calls += 1
+            if copy_once.calls > 1:
+                return 0
+            return os.write(dst_fd, os.read(src_fd, 100))
+        copy_once.calls = 0
+        with mock.patch.object(os, "copy_file_range", copy_once, create=True), \
+                mock.patch.object(os, "sendfile", create=True, side_effect=OSError):
+            pss.atomic_copy(self.src, self.dst)
+        self.assertEqual(self.read_dst(), SAVE_DATA)
+
+    @unittest.skipUnless(hasattr(os, "symlink") and os.name != "nt", "needs symlinks")
+    def test_symlinked_save_stays_a_symlink(self):
+        target = os.path.join(self.tmp.name, "real.sav")
+        os.replace(self.dst, target)
+        os.symlink(target, self.dst)
+        pss.atomic_copy(self.src, self.dst)
+        self.assertTrue(os.path.islink(self.dst))
+        self.assertEqual(self.read_dst(), SAVE_DATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for telling which content a running RetroArch has loaded."""
+
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PokemonStadiumSync as pss  # noqa: E402
+
+
+class FakeProcess:
+    """Stands in for a psutil.Process of RetroArch."""
+
+    def __init__(self, cmdline, cwd, open_files=()):
+        self._cmdline = cmdline
+        self._cwd = cwd
+        self._open_files = [SimpleNamespace(path=path) for path in open_files]
+
+    def cmdline(self):
+        return self._cmdline
+
+    def cwd(self):
+        return self._cwd
+
+    def open_files(self):
+        return self._open_files
+
+
+class LoadedContentTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rom = os.path.join(self.tmp.name, "Pokemon Stadium (USA).n64")
+        self.save = os.path.join(self.tmp.name, "Pokemon Stadium 2 (USA).srm")
+        for path in (self.rom, self.save):
+            open(path, "wb").close()
+        self.tracker = pss.RetroArchTracker()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, process):
+        self.tracker._processes = {1: process}
+        return self.tracker._read_content()
+
+    def test_started_content_still_open(self):
+        content = self.read(FakeProcess(["retroarch", "-L", "core.so", self.rom], self.tmp.name, [self.rom]))
+        self.assertIn("pokemon stadium (usa)", content)
+
+    def test_menu_load_is_unknown(self):
+        # Started with Stadium, then Stadium 2 loaded from the menu: the command line is stale
+        content = self.read(FakeProcess(["retroarch", "-L", "core.so", self.rom], self.tmp.name))
+        self.assertIsNone(content)
+
+    def test_open_save_names_the_game(self):
+        content = self.read(FakeProcess(["retroarch", "-L", "core.so", self.rom], self.tmp.name, [self.save]))
+        self.assertIn("pokemon stadium 2 (usa)", content)
+        self.assertNotIn("pokemon stadium (usa)", content)
+
+    def test_menu_load_holds_every_slot(self):
+        self.tracker._processes = {1: FakeProcess(["retroarch", "-L", "core.so", self.rom], self.tmp.name)}
+        self.tracker.is_running = lambda refresh=False: True
+        engine = SimpleNamespace(retroarch_tracker=self.tracker, config=SimpleNamespace(retroarch_hold="in_use"))
+        for name in ("Pokemon Stadium (USA)", "Pokemon Stadium 2 (USA)"):
+            slot = SimpleNamespace(srm=os.path.join(self.tmp.name, name + ".srm"),
+                                   sav=os.path.join(self.tmp.name, name + ".sav"))
+            self.assertTrue(pss.SyncEngine.slot_in_use(engine, slot))
+
+
+if __name__ == "__main__":
+    unittest.main()